@@ -33,6 +33,8 @@ from app.models import (
     activity_log,
     system_setting,
     rule,
+    floor_event,
+    floor_version,
 )
 
 target_metadata = Base.metadata
@@ -0,0 +1,34 @@
+"""attendee_seating_needs
+
+Revision ID: 41d858f14ce9
+Revises: 7a3f26c8cad5
+Create Date: 2026-10-17 16:31:55.802446
+
+What the seat assigner needs to know about a guest: whether they need an
+accessible seat, and preference tags matched against Seat.preferences.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '41d858f14ce9'
+down_revision: Union[str, Sequence[str], None] = '7a3f26c8cad5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'reservation_attendees',
+        sa.Column('needs_accessible_seat', sa.Boolean(), server_default='false', nullable=False),
+    )
+    op.add_column('reservation_attendees', sa.Column('seat_preferences', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('reservation_attendees', 'seat_preferences')
+    op.drop_column('reservation_attendees', 'needs_accessible_seat')
@@ -0,0 +1,39 @@
+"""floor_events
+
+Revision ID: 61d261ae6cf8
+Revises: 93d87dbc4c31
+Create Date: 2026-10-17 11:40:27.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '61d261ae6cf8'
+down_revision: Union[str, Sequence[str], None] = '93d87dbc4c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('floor_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('service_date', sa.Date(), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_floor_events'))
+    )
+    op.create_index(op.f('ix_floor_events_created_at'), 'floor_events', ['created_at'], unique=False)
+    op.create_index(op.f('ix_floor_events_service_date'), 'floor_events', ['service_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_floor_events_service_date'), table_name='floor_events')
+    op.drop_index(op.f('ix_floor_events_created_at'), table_name='floor_events')
+    op.drop_table('floor_events')
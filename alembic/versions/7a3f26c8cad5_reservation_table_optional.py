@@ -0,0 +1,31 @@
+"""reservation_table_optional
+
+Revision ID: 7a3f26c8cad5
+Revises: e550e8171c14
+Create Date: 2026-10-17 15:48:12.660317
+
+reservations.table_id becomes nullable: room-level bookings wait without a
+table until staff or the table assigner picks one. The no-overlap exclusion
+constraint already ignores NULL table_ids.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3f26c8cad5'
+down_revision: Union[str, Sequence[str], None] = 'e550e8171c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('reservations', 'table_id', existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails while unassigned bookings exist; assign or cancel them first
+    op.alter_column('reservations', 'table_id', existing_type=sa.Integer(), nullable=False)
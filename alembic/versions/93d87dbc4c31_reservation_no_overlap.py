@@ -0,0 +1,102 @@
+"""reservation_no_overlap
+
+Revision ID: 93d87dbc4c31
+Revises: d78e7afd14a3
+Create Date: 2026-10-17 09:12:05.418227
+
+Adds reservations.booked_during (generated tsrange of date + start/end
+time) and a GiST exclusion constraint so no two active reservations can
+hold the same table at overlapping times, enforced by Postgres itself.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '93d87dbc4c31'
+down_revision: Union[str, Sequence[str], None] = 'd78e7afd14a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist gives GiST an equality operator class for table_id
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    # Bookings used to default end_time to start_time. Give them the standard
+    # 90 minutes (RESERVATION_DEFAULT_DURATION_MINUTES), capped at 23:59.
+    # Starts from 23:59 on leave no room (the app now rejects them): those
+    # rows end at the last instant of the day so the CHECK holds, and are
+    # cancelled with a note so staff can find and rebook them.
+    op.execute(
+        """
+        UPDATE reservations
+        SET end_time = CASE
+                WHEN start_time < TIME '22:30' THEN start_time + INTERVAL '90 minutes'
+                WHEN start_time < TIME '23:59' THEN TIME '23:59'
+                ELSE TIME '23:59:59.999999'
+            END,
+            status = CASE WHEN start_time >= TIME '23:59' THEN 'cancelled' ELSE status END,
+            notes = CASE
+                WHEN start_time >= TIME '23:59'
+                THEN concat_ws(E'\\n', notes, '[migration 93d87dbc4c31] Cancelled: start time left no room before midnight.')
+                ELSE notes
+            END
+        WHERE end_time <= start_time
+        """
+    )
+    op.create_check_constraint(
+        'ck_reservations_end_after_start',
+        'reservations',
+        'end_time > start_time',
+    )
+
+    op.add_column(
+        'reservations',
+        sa.Column(
+            'booked_during',
+            postgresql.TSRANGE(),
+            sa.Computed("tsrange(date + start_time, date + end_time, '[)')", persisted=True),
+            nullable=True,
+        ),
+    )
+
+    # Fail with a readable message rather than a bare constraint error
+    conn = op.get_bind()
+    clashes = conn.execute(sa.text(
+        """
+        SELECT a.id, b.id
+        FROM reservations a
+        JOIN reservations b
+          ON a.table_id = b.table_id
+         AND a.id < b.id
+         AND a.booked_during && b.booked_during
+        WHERE a.status <> 'cancelled' AND b.status <> 'cancelled'
+        LIMIT 20
+        """
+    )).all()
+    if clashes:
+        pairs = ", ".join(f"{a}/{b}" for a, b in clashes)
+        raise RuntimeError(
+            f"Overlapping active reservations on the same table ({pairs}); "
+            "cancel or move them, then re-run the migration."
+        )
+
+    op.create_exclude_constraint(
+        'ex_reservations_table_no_overlap',
+        'reservations',
+        ('table_id', '='),
+        ('booked_during', '&&'),
+        where=sa.text("status <> 'cancelled'"),
+        using='gist',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ex_reservations_table_no_overlap', 'reservations', type_='exclude')
+    op.drop_column('reservations', 'booked_during')
+    op.drop_constraint('ck_reservations_end_after_start', 'reservations', type_='check')
@@ -0,0 +1,35 @@
+"""kitchen_queue_index
+
+Revision ID: 94ef1c7fb993
+Revises: b217f426cf92
+Create Date: 2026-10-17 14:22:10.583604
+
+Partial index for the kitchen queue: fired reservations only, in fire
+order. It stays as small as the number of open tickets.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '94ef1c7fb993'
+down_revision: Union[str, Sequence[str], None] = 'b217f426cf92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_reservations_kitchen_queue',
+        'reservations',
+        ['fired_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'fired'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservations_kitchen_queue', table_name='reservations')
@@ -0,0 +1,97 @@
+"""reservation_attendee_count
+
+Revision ID: b217f426cf92
+Revises: 61d261ae6cf8
+Create Date: 2026-10-17 13:05:41.220918
+
+Adds reservations.attendee_count, backfilled from reservation_attendees and
+kept current by statement-level triggers, so party_size no longer needs the
+attendee rows loaded.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b217f426cf92'
+down_revision: Union[str, Sequence[str], None] = '61d261ae6cf8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One UPDATE per statement (not per row), grouped by reservation, so a
+# multi-row attendee INSERT touches each reservation once. Updates only
+# write when an attendee actually moved between reservations.
+COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION reservations_sync_attendee_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reservations r
+        SET attendee_count = r.attendee_count + d.n
+        FROM (SELECT reservation_id, count(*) AS n FROM new_rows GROUP BY reservation_id) d
+        WHERE r.id = d.reservation_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE reservations r
+        SET attendee_count = r.attendee_count - d.n
+        FROM (SELECT reservation_id, count(*) AS n FROM old_rows GROUP BY reservation_id) d
+        WHERE r.id = d.reservation_id;
+    ELSE
+        UPDATE reservations r
+        SET attendee_count = r.attendee_count + d.n
+        FROM (
+            SELECT reservation_id, sum(n) AS n
+            FROM (
+                SELECT reservation_id, 1 AS n FROM new_rows
+                UNION ALL
+                SELECT reservation_id, -1 AS n FROM old_rows
+            ) moved
+            GROUP BY reservation_id
+            HAVING sum(n) <> 0
+        ) d
+        WHERE r.id = d.reservation_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    'trg_reservation_attendees_count_ins': "AFTER INSERT ON reservation_attendees REFERENCING NEW TABLE AS new_rows",
+    'trg_reservation_attendees_count_del': "AFTER DELETE ON reservation_attendees REFERENCING OLD TABLE AS old_rows",
+    'trg_reservation_attendees_count_upd': (
+        "AFTER UPDATE ON reservation_attendees REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'reservations',
+        sa.Column('attendee_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE reservations r
+        SET attendee_count = c.n
+        FROM (SELECT reservation_id, count(*) AS n FROM reservation_attendees GROUP BY reservation_id) c
+        WHERE r.id = c.reservation_id
+        """
+    )
+
+    op.execute(COUNT_FUNCTION)
+    for name, when in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {when} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION reservations_sync_attendee_count()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON reservation_attendees")
+    op.execute("DROP FUNCTION IF EXISTS reservations_sync_attendee_count()")
+    op.drop_column('reservations', 'attendee_count')
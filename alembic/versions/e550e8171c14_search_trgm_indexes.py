@@ -0,0 +1,47 @@
+"""search_trgm_indexes
+
+Revision ID: e550e8171c14
+Revises: 94ef1c7fb993
+Create Date: 2026-10-17 15:02:47.319045
+
+pg_trgm GIN indexes behind GET /api/ops/search: user names and emails,
+attendee names and reservation notes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e550e8171c14'
+down_revision: Union[str, Sequence[str], None] = '94ef1c7fb993'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index, table, column)
+TRGM_INDEXES = [
+    ('ix_users_name_trgm', 'users', 'name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_reservation_attendees_name_trgm', 'reservation_attendees', 'name'),
+    ('ix_reservations_notes_trgm', 'reservations', 'notes'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRGM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in TRGM_INDEXES:
+        op.drop_index(name, table_name=table)
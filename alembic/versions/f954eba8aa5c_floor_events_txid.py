@@ -0,0 +1,42 @@
+"""floor_events_txid
+
+Revision ID: f954eba8aa5c
+Revises: ff0b15a14f55
+Create Date: 2026-10-17 18:41:07.264519
+
+Records the writing transaction's id on each floor event. Sequence ids
+are handed out at insert but rows become visible in commit order, so
+"id > last seen" can skip a lower id that commits later. Streams now
+resume from a transaction horizon (pg_snapshot_xmin): every transaction
+below it has committed, so nothing older can still appear.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f954eba8aa5c'
+down_revision: Union[str, Sequence[str], None] = 'ff0b15a14f55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'floor_events',
+        sa.Column(
+            'txid',
+            sa.BigInteger(),
+            server_default=sa.text('pg_current_xact_id()::text::bigint'),
+            nullable=False,
+        ),
+    )
+    op.create_index(op.f('ix_floor_events_txid'), 'floor_events', ['txid'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_floor_events_txid'), table_name='floor_events')
+    op.drop_column('floor_events', 'txid')
@@ -0,0 +1,149 @@
+"""floor_versions
+
+Revision ID: ff0b15a14f55
+Revises: 41d858f14ce9
+Create Date: 2026-10-17 18:02:13.518734
+
+Adds floor_versions, a per-date (and "*" floor-wide) counter bumped by
+statement-level triggers on every table the floor snapshot reads. The
+bump row-locks until commit, so versions follow commit order, which
+max(updated_at) does not: it is stamped when a transaction writes, not
+when it becomes visible.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'ff0b15a14f55'
+down_revision: Union[str, Sequence[str], None] = '41d858f14ce9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Scopes are bumped in sorted order so two transactions touching the same
+# dates take the row locks in the same order.
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION floor_versions_bump(scopes text[]) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO floor_versions (scope, version)
+    SELECT DISTINCT s, 1 FROM unnest(scopes) s WHERE s IS NOT NULL ORDER BY s
+    ON CONFLICT (scope) DO UPDATE SET version = floor_versions.version + 1
+$$
+"""
+
+RESERVATIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION floor_versions_reservations() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM floor_versions_bump(ARRAY(SELECT to_char(date, 'YYYY-MM-DD') FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM floor_versions_bump(ARRAY(SELECT to_char(date, 'YYYY-MM-DD') FROM old_rows));
+    ELSE
+        PERFORM floor_versions_bump(ARRAY(
+            SELECT to_char(date, 'YYYY-MM-DD') FROM new_rows
+            UNION
+            SELECT to_char(date, 'YYYY-MM-DD') FROM old_rows
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# Attendees carry no date: bump their reservations' dates
+ATTENDEES_FUNCTION = """
+CREATE OR REPLACE FUNCTION floor_versions_attendees() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM floor_versions_bump(ARRAY(
+            SELECT to_char(r.date, 'YYYY-MM-DD') FROM reservations r
+            WHERE r.id IN (SELECT reservation_id FROM new_rows)
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM floor_versions_bump(ARRAY(
+            SELECT to_char(r.date, 'YYYY-MM-DD') FROM reservations r
+            WHERE r.id IN (SELECT reservation_id FROM old_rows)
+        ));
+    ELSE
+        PERFORM floor_versions_bump(ARRAY(
+            SELECT to_char(r.date, 'YYYY-MM-DD') FROM reservations r
+            WHERE r.id IN (SELECT reservation_id FROM new_rows UNION SELECT reservation_id FROM old_rows)
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+LAYOUT_FUNCTION = """
+CREATE OR REPLACE FUNCTION floor_versions_layout() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM floor_versions_bump(ARRAY['*']);
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    'trg_reservations_floor_version_ins': (
+        "AFTER INSERT ON reservations REFERENCING NEW TABLE AS new_rows", 'floor_versions_reservations'
+    ),
+    'trg_reservations_floor_version_del': (
+        "AFTER DELETE ON reservations REFERENCING OLD TABLE AS old_rows", 'floor_versions_reservations'
+    ),
+    'trg_reservations_floor_version_upd': (
+        "AFTER UPDATE ON reservations REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        'floor_versions_reservations',
+    ),
+    'trg_reservation_attendees_floor_version_ins': (
+        "AFTER INSERT ON reservation_attendees REFERENCING NEW TABLE AS new_rows", 'floor_versions_attendees'
+    ),
+    'trg_reservation_attendees_floor_version_del': (
+        "AFTER DELETE ON reservation_attendees REFERENCING OLD TABLE AS old_rows", 'floor_versions_attendees'
+    ),
+    'trg_reservation_attendees_floor_version_upd': (
+        "AFTER UPDATE ON reservation_attendees REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        'floor_versions_attendees',
+    ),
+    'trg_dining_rooms_floor_version': (
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON dining_rooms", 'floor_versions_layout'
+    ),
+    'trg_table_entities_floor_version': (
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON table_entities", 'floor_versions_layout'
+    ),
+    'trg_seats_floor_version': (
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON seats", 'floor_versions_layout'
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('floor_versions',
+    sa.Column('scope', sa.String(length=10), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', name=op.f('pk_floor_versions'))
+    )
+
+    op.execute(BUMP_FUNCTION)
+    op.execute(RESERVATIONS_FUNCTION)
+    op.execute(ATTENDEES_FUNCTION)
+    op.execute(LAYOUT_FUNCTION)
+    for name, (when, function) in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {when} FOR EACH STATEMENT EXECUTE FUNCTION {function}()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, (when, _) in TRIGGERS.items():
+        table = when.split(" ON ")[1].split()[0]
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    for function in ('floor_versions_layout()', 'floor_versions_attendees()', 'floor_versions_reservations()'):
+        op.execute(f"DROP FUNCTION IF EXISTS {function}")
+    op.execute("DROP FUNCTION IF EXISTS floor_versions_bump(text[])")
+    op.drop_table('floor_versions')
@@ -0,0 +1,50 @@
+# app/assign_tables.py
+"""
+Assigns tables to room-level bookings before service (same solver and
+single transaction as POST /api/ops/assign-tables):
+    python -m app.assign_tables --date 2026-11-02 --meal Dinner --room 1 [--dry-run]
+Exits 1 if some bookings could not be seated or the plan went stale.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date
+
+from app.database import SessionLocal
+from app.utils.table_assignment import StalePlan, assign_tables
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", required=True, type=date.fromisoformat, help="Service date, YYYY-MM-DD")
+    parser.add_argument("--meal", required=True, help="meal_type, e.g. Dinner")
+    parser.add_argument("--room", required=True, type=int, help="dining_room_id")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without saving it")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        try:
+            plan = assign_tables(db, args.date, args.meal, args.room, dry_run=args.dry_run)
+        except StalePlan as e:
+            print(f"❌ {e}; nothing saved, run it again.")
+            return 1
+
+    for a in plan.assigned:
+        print(
+            f"  reservation {a['reservation_id']:>6} -> table {a['table_number']:>3} "
+            f"({a['party_size']}/{a['seat_count']} seats, {a['start_time']:%H:%M}-{a['end_time']:%H:%M})"
+        )
+    for u in plan.unassigned:
+        print(f"  reservation {u['reservation_id']:>6} unassigned: {u['reason']}")
+
+    verb = "Planned" if args.dry_run else "Assigned"
+    print(
+        f"{'📝' if args.dry_run else '✅'} {verb} {len(plan.assigned)} booking(s), "
+        f"{len(plan.unassigned)} left over, {plan.wasted_seats} empty seat(s), solved in {plan.solve_ms} ms."
+    )
+    return 1 if plan.unassigned else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Literal, Any
+from typing import Literal, Any, List
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,11 +18,70 @@ class Settings(BaseSettings):
     # the hint as 'str'.
     DATABASE_URL: str = None  # type: ignore[assignment]
     SECRET_KEY: str = None    # type: ignore[assignment]
+
+    # Read replicas: comma-separated URLs. GET requests read from a replica
+    # unless the caller wrote within REPLICA_LAG_BUDGET_SECONDS (read-your-writes).
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_LAG_BUDGET_SECONDS: float = 5.0
+
+    # Connection pools (see app/database.py)
+    # "fixed": every engine uses DB_POOL_SIZE + DB_MAX_OVERFLOW.
+    # "auto":  DB_CONNECTION_BUDGET (per database server) is split across
+    #          WEB_CONCURRENCY workers and the engines each worker opens.
+    DB_POOL_MODE: Literal["fixed", "auto"] = "fixed"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECTION_BUDGET: int = 100
+    # Same variable uvicorn/gunicorn read for the worker count
+    WEB_CONCURRENCY: int = 1
+
+    # Per-request SQL accounting (see app/utils/query_counter.py)
+    # X-DB-Queries / X-DB-Time headers are added outside production; requests
+    # over either budget are logged, as are statements repeated in one request.
+    DB_QUERY_BUDGET: int = 20
+    DB_TIME_BUDGET_MS: float = 250.0
+    DB_REPEATED_QUERY_THRESHOLD: int = 5
+    # Test runs: default (lazy="select") relationships raise instead of querying
+    DB_STRICT_LAZY_LOADS: bool = False
     
     # Security
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_MINUTES: int = 60 * 24
 
+    # Password hashing (see app/utils/passwords.py)
+    # Stored hashes with a different cost are rehashed on the next login.
+    BCRYPT_ROUNDS: int = 12
+    # bcrypt releases the GIL, so a small thread pool gives real parallelism
+    # without competing with the AnyIO threadpool that serves sync routes.
+    LOGIN_HASH_WORKERS: int = 4
+    # Logins waiting on (or running in) the pool before we answer 503.
+    LOGIN_MAX_PENDING: int = 32
+    # last_login_at is buffered in memory and written in bulk this often
+    # (and on shutdown), so login never writes to the database.
+    LAST_LOGIN_FLUSH_SECONDS: float = 5.0
+
+    # Principal cache (see app/utils/principal_cache.py)
+    # Bounds how long a role/status change made outside the admin routes
+    # (or by another worker) can take to be seen by get_current_user.
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Reservations (see app/utils/availability.py)
+    # Length of a booking sent without an end_time (one at or before the start is rejected)
+    RESERVATION_DEFAULT_DURATION_MINUTES: int = 90
+
+    # Live floor stream (see app/utils/floor_events.py)
+    # A tablet away longer than the retention window should refetch /api/ops/floor.
+    FLOOR_EVENTS_RETENTION_HOURS: int = 24
+    FLOOR_STREAM_HEARTBEAT_SECONDS: float = 15.0
+
+    # Postgres LISTEN/NOTIFY listener (see app/utils/pg_listener.py)
+    # Keeps per-worker caches (ACL, ...) in sync across uvicorn workers.
+    PG_LISTENER_ENABLED: bool = True
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -30,6 +89,10 @@ class Settings(BaseSettings):
         case_sensitive=False,
     )
 
+    @property
+    def replica_urls(self) -> List[str]:
+        return [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
     def model_post_init(self, __context: Any) -> None:
         """
         Since we gave the fields defaults of None to satisfy the linter,
@@ -1,8 +1,16 @@
 # app/database.py
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import random
+
+from fastapi import Request
+from sqlalchemy import create_engine, MetaData, Select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 from app.config import settings
+from app.utils.db_metrics import PoolMetrics, instrument_engine, instrumented_pool_class
+from app.utils.query_counter import enable_strict_lazy_loads
+from app.utils.replica_routing import wants_replica
 
 # Naming convention for constraints (makes Alembic migrations much easier)
 POSTGRES_NAMING_CONVENTION = {
@@ -13,34 +21,142 @@ POSTGRES_NAMING_CONVENTION = {
     "pk": "pk_%(table_name)s"
 }
 
+# Engines each worker opens against one server: the sync and the async engine
+ENGINES_PER_SERVER = 2
+
+def pool_sizing() -> tuple[int, int]:
+    """
+    (pool_size, max_overflow) for each engine.
+    In auto mode, the per-server connection budget is divided by workers and
+    engines; one connection per worker is held back for the pg_listener.
+    Two thirds stay open, the rest is burst overflow.
+    """
+    if settings.DB_POOL_MODE == "fixed":
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    per_worker = settings.DB_CONNECTION_BUDGET // max(1, settings.WEB_CONCURRENCY)
+    if settings.PG_LISTENER_ENABLED:
+        per_worker -= 1
+    per_engine = max(2, per_worker // ENGINES_PER_SERVER)
+    pool_size = max(1, (per_engine * 2) // 3)
+    return pool_size, per_engine - pool_size
+
+POOL_SIZE, MAX_OVERFLOW = pool_sizing()
+
+def pool_options(name: str, is_async: bool = False) -> dict:
+    """Engine kwargs shared by the primary and every replica, sync and async."""
+    return dict(
+        poolclass=instrumented_pool_class(PoolMetrics(name), is_async=is_async),
+        pool_pre_ping=settings.DB_POOL_PRE_PING,    # Test connections before using
+        pool_size=POOL_SIZE,                        # Connections kept open
+        max_overflow=MAX_OVERFLOW,                  # Peak capacity
+        pool_recycle=settings.DB_POOL_RECYCLE,      # Refresh connections hourly
+        pool_timeout=settings.DB_POOL_TIMEOUT,      # Seconds to wait for a free connection
+        echo=False,                                 # Set to True for SQL debug logging
+    )
+
+def async_url(url: str) -> str:
+    """Same database, but always through psycopg 3's native asyncio driver."""
+    return make_url(url).set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+
+def libpq_url(url: str) -> str:
+    """
+    Strips the SQLAlchemy driver suffix (e.g. postgresql+psycopg://) so the URL
+    can be handed straight to psycopg for connections that live outside the pool.
+    """
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
 # Production-ready Postgres connection
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,          # Test connections before using
-    pool_size=5,                 # Minimum connections to keep open
-    max_overflow=10,             # Peak capacity
-    pool_recycle=3600,           # Refresh connections hourly
-    pool_timeout=30,             # Seconds to wait for a free connection
-    echo=False,                  # Set to True for SQL debug logging
+engine = instrument_engine("primary", create_engine(settings.DATABASE_URL, **pool_options("primary")))
+
+# Async engine for hot read routes (async def handlers), so their concurrency
+# is bounded by the pool rather than by the AnyIO threadpool.
+async_engine = create_async_engine(
+    async_url(settings.DATABASE_URL), **pool_options("primary_async", is_async=True)
 )
+instrument_engine("primary_async", async_engine.sync_engine)
+
+# Streaming replicas (DATABASE_REPLICA_URLS). Empty list = everything on primary.
+replica_engines = []
+async_replica_engines = []
+for i, url in enumerate(settings.replica_urls):
+    replica_engines.append(
+        instrument_engine(f"replica_{i}", create_engine(url, **pool_options(f"replica_{i}")))
+    )
+    async_replica = create_async_engine(
+        async_url(url), **pool_options(f"replica_{i}_async", is_async=True)
+    )
+    instrument_engine(f"replica_{i}_async", async_replica.sync_engine)
+    async_replica_engines.append(async_replica)
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to one replica when the session was opened for a
+    replica-safe request (session.info["use_replica"]); everything else,
+    including flushes and SELECT ... FOR UPDATE, goes to the primary.
+    """
+    primary = engine
+    replicas = replica_engines
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.replicas
+            and self.info.get("use_replica")
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            # One replica per session keeps a request's reads mutually consistent
+            if "replica" not in self.info:
+                self.info["replica"] = random.choice(self.replicas)
+            return self.info["replica"]
+        return self.primary
+
+
+class AsyncRoutingSession(RoutingSession):
+    """RoutingSession for AsyncSession: binds must be the async engines' sync facades."""
+    primary = async_engine.sync_engine
+    replicas = [e.sync_engine for e in async_replica_engines]
+
 
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False,      # No implicit IO after commit in async code
 )
 
 class Base(DeclarativeBase):
     """Base class for all models"""
     metadata = MetaData(naming_convention=POSTGRES_NAMING_CONVENTION)
 
-def get_db():
+if settings.DB_STRICT_LAZY_LOADS:
+    enable_strict_lazy_loads(Base.registry)
+
+def get_db(request: Request):
     """
     Dependency for FastAPI routes.
     Ensures that the DB session is closed after the request is finished.
+    GET requests read from a replica unless the caller is pinned to the primary.
     """
     db = SessionLocal()
+    db.info["use_replica"] = wants_replica(request)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request):
+    """
+    Async counterpart of get_db for `async def` routes.
+    Relationships must be eager-loaded: lazy loads raise under AsyncSession.
+    """
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info["use_replica"] = wants_replica(request)
+        yield db
@@ -1,9 +1,9 @@
 import os
+import asyncio
 import logging
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from alembic.config import Config
-from alembic import command
 from contextlib import asynccontextmanager
 
 from app.routes import (
@@ -13,29 +13,54 @@ from app.routes import (
     admin_users, admin_seats, ops,
     reservation_messages, notifications
 )
+from app.config import settings
+from app.database import async_engine, async_replica_engines
+from app.migrate import migrate
+from app.utils.availability import AVAILABILITY_CHANNEL, handle_availability_notify
+from app.utils.floor_events import FLOOR_CHANNEL, handle_floor_notify, prune_events
+from app.utils.login_tracker import last_login_buffer
+from app.utils.passwords import shutdown_hash_pool
+from app.utils.permissions import ACL_CHANNEL, handle_acl_notify
+from app.utils.pg_listener import pg_listener
+from app.utils import query_counter
+from app.utils.replica_routing import DB_PIN_HEADER, pin_to_primary
 from app.utils.toast_responses import error_server
 
-def run_migrations() -> None:
-    """Syncs the database schema to the latest Alembic head."""
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    ini_path = os.path.join(base_dir, "alembic.ini")
-    alembic_cfg = Config(ini_path)
-    alembic_cfg.set_main_option("script_location", os.path.join(base_dir, "alembic"))
-    db_url = os.environ.get("DATABASE_URL")
-    if db_url:
-        alembic_cfg.set_main_option("sqlalchemy.url", db_url)
-    try:
-        command.upgrade(alembic_cfg, "head")
-        print("✅ Database migrations synced to head.")
-    except Exception as e:
-        print(f"❌ Migration failed: {e}")
+async def prune_floor_events(every_seconds: float = 3600) -> None:
+    """Keeps floor_events (the live stream's resume log) inside its retention window."""
+    while True:
+        try:
+            await run_in_threadpool(prune_events)
+        except Exception as e:
+            logging.warning(f"floor_events prune failed: {e}")
+        await asyncio.sleep(every_seconds)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Set RUN_MIGRATIONS=0 when `python -m app.migrate` runs as a deploy step
     if os.environ.get("RUN_MIGRATIONS", "1") == "1":
-        run_migrations()
+        try:
+            migrate()
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+
+    if settings.PG_LISTENER_ENABLED:
+        pg_listener.subscribe(ACL_CHANNEL, handle_acl_notify)
+        pg_listener.subscribe(AVAILABILITY_CHANNEL, handle_availability_notify)
+        pg_listener.subscribe(FLOOR_CHANNEL, handle_floor_notify)
+        pg_listener.start()
+    last_login_buffer.start()
+    pruner = asyncio.create_task(prune_floor_events())
+
     yield
 
+    pruner.cancel()
+    last_login_buffer.stop()
+    pg_listener.stop()
+    shutdown_hash_pool()
+    for e in [async_engine, *async_replica_engines]:
+        await e.dispose()
+
 app = FastAPI(
     title="Sterling Catering API", 
     redirect_slashes=False,
@@ -56,9 +81,37 @@ app.add_middleware(
         "Accept",
         "Origin",
         "X-Requested-With",
+        "If-None-Match",
+        DB_PIN_HEADER,
+    ],
+    expose_headers=[
+        "ETag",
+        DB_PIN_HEADER,
+        query_counter.DB_QUERIES_HEADER,
+        query_counter.DB_TIME_HEADER,
     ],
 )
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Pins callers to the primary for a short window after a successful write."""
+    response = await call_next(request)
+    pin_to_primary(request, response)
+    return response
+
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    """Counts SQL statements and DB time per request (headers outside production)."""
+    stats = query_counter.start_request()
+    response = await call_next(request)
+
+    route = request.scope.get("route")
+    query_counter.report(f"{request.method} {getattr(route, 'path', request.url.path)}", stats)
+    if settings.ENVIRONMENT != "production":
+        response.headers[query_counter.DB_QUERIES_HEADER] = str(stats.count)
+        response.headers[query_counter.DB_TIME_HEADER] = f"{stats.elapsed_ms:.1f}"
+    return response
+
 # -- Simplified Route Registration --
 # Each router is included ONCE with its functional prefix.
 
@@ -0,0 +1,113 @@
+# app/migrate.py
+"""
+Startup migrations that are cheap when there is nothing to do.
+
+Every worker runs this on boot (RUN_MIGRATIONS=1), so the common path is a
+single `alembic_version` read compared against the head revision parsed from
+alembic/versions/ - no Alembic import, no script-directory load. Only when the
+database is behind do we take a Postgres advisory lock, so exactly one worker
+upgrades while the others wait and then see the new head.
+
+Also runnable as a deploy step before the workers start:
+    python -m app.migrate
+"""
+from __future__ import annotations
+
+import os
+import re
+import sys
+import time
+from typing import Set
+
+from sqlalchemy import text
+
+from app.database import engine
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERSIONS_DIR = os.path.join(BASE_DIR, "alembic", "versions")
+
+# Arbitrary but fixed: every worker and `python -m app.migrate` share this key
+MIGRATION_LOCK_KEY = 0x5E7A11E6
+
+_REVISION_RE = re.compile(r"^revision(?:\s*:\s*\w+)?\s*=\s*['\"](\w+)['\"]", re.M)
+_DOWN_RE = re.compile(r"^down_revision(?:\s*:[^=]+)?=\s*(.+)$", re.M)
+
+
+def script_heads() -> Set[str]:
+    """Head revisions of alembic/versions/, by reading the files rather than importing Alembic."""
+    revisions, parents = set(), set()
+    for name in os.listdir(VERSIONS_DIR):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(VERSIONS_DIR, name), encoding="utf-8") as f:
+            source = f.read()
+        rev = _REVISION_RE.search(source)
+        if not rev:
+            continue
+        revisions.add(rev.group(1))
+        down = _DOWN_RE.search(source)
+        if down:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down.group(1)))
+    return revisions - parents
+
+
+def db_revisions(conn) -> Set[str]:
+    if conn.execute(text("SELECT to_regclass('alembic_version')")).scalar() is None:
+        return set()
+    return set(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+
+
+def _alembic_upgrade() -> None:
+    # Imported here so the already-at-head path never pays for Alembic
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(BASE_DIR, "alembic"))
+    db_url = os.environ.get("DATABASE_URL")
+    if db_url:
+        cfg.set_main_option("sqlalchemy.url", db_url)
+    command.upgrade(cfg, "head")
+
+
+def migrate() -> bool:
+    """
+    Brings the database to head. Returns True if an upgrade ran.
+    Raises on failure (callers decide whether that is fatal).
+    """
+    started = time.perf_counter()
+    heads = script_heads()
+
+    with engine.connect() as conn:
+        if heads and db_revisions(conn) == heads:
+            print(f"✅ Database already at head ({(time.perf_counter() - started) * 1000:.0f} ms).")
+            return False
+
+        # Session-level lock, held on this connection while Alembic migrates on its own
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            # Another worker may have finished the upgrade while we waited
+            if heads and db_revisions(conn) == heads:
+                upgraded = False
+            else:
+                conn.rollback()
+                _alembic_upgrade()
+                upgraded = True
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.commit()
+
+    elapsed = (time.perf_counter() - started) * 1000
+    if upgraded:
+        print(f"✅ Database migrations synced to head ({elapsed:.0f} ms).")
+    else:
+        print(f"✅ Database brought to head by another worker ({elapsed:.0f} ms).")
+    return upgraded
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
@@ -21,6 +21,8 @@ from .notification import Notification
 from .daily_stat import DailyStat
 from .seat import Seat
 from .system_setting import SystemSetting
+from .floor_event import FloorEvent
+from .floor_version import FloorVersion
 
 __all__ = [
     "Base",
@@ -43,4 +45,6 @@ __all__ = [
     "DailyStat",
     "Seat",
     "SystemSetting",
+    "FloorEvent",
+    "FloorVersion",
 ]
\ No newline at end of file
@@ -0,0 +1,45 @@
+# app/models/floor_event.py
+from __future__ import annotations
+from datetime import date as date_type, datetime
+from typing import Any, Dict
+
+from sqlalchemy import BigInteger, Date, DateTime, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class FloorEvent(Base):
+    """Append-only log behind /api/ops/stream.
+
+    txid (the writing transaction) backs the SSE resume token: ids are
+    assigned at insert but rows appear in commit order, so a reconnecting
+    tablet resumes from a transaction horizon instead (see floor_events
+    utils). Rows older than FLOOR_EVENTS_RETENTION_HOURS are pruned.
+    """
+    __tablename__ = "floor_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    # e.g. "reservation.created", "reservation.fired", "attendees.synced", "seat.updated"
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    # Service date the event belongs to; NULL for floor-wide changes (seats)
+    service_date: Mapped[date_type | None] = mapped_column(Date, nullable=True, index=True)
+
+    # pg_current_xact_id() of the transaction that wrote the event
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("pg_current_xact_id()::text::bigint"),
+        nullable=False,
+        index=True,
+    )
+
+    # Compact diff sent to clients as the SSE data line
+    data: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
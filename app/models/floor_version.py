@@ -0,0 +1,22 @@
+# app/models/floor_version.py
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class FloorVersion(Base):
+    """Commit-ordered version of the floor plan, behind the /api/ops/floor ETag.
+
+    Bumped by triggers (migration ff0b15a14f55) in every transaction that
+    writes reservations or attendees (one row per service date) or the
+    layout (rooms, tables, seats: the "*" row). The bump row-locks until
+    commit, so versions increase in commit order and a snapshot that reads
+    version N has every change up to N.
+    """
+    __tablename__ = "floor_versions"
+
+    # ISO service date, or "*" for the floor-wide layout
+    scope: Mapped[str] = mapped_column(String(10), primary_key=True)
+
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=1)
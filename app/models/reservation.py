@@ -1,11 +1,12 @@
 # app/models/reservation.py
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from datetime import datetime, timezone, date as date_type, time as time_type
 from decimal import Decimal
 
-from sqlalchemy import String, ForeignKey, DateTime, Date, Time, Text, JSON
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Date, Time, Text, JSON, CheckConstraint, Computed, Index, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint, TSRANGE
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -20,19 +21,50 @@ if TYPE_CHECKING:
     from app.models.table_entity import TableEntity
     from app.models.user import User
 
+TABLE_OVERLAP_CONSTRAINT = "ex_reservations_table_no_overlap"
+
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        # Naming convention expands this to ck_reservations_end_after_start
+        CheckConstraint("end_time > start_time", name="end_after_start"),
+        # One active booking per table at a time, enforced by Postgres (btree_gist)
+        ExcludeConstraint(
+            ("table_id", "="),
+            ("booked_during", "&&"),
+            name=TABLE_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("status <> 'cancelled'"),
+        ),
+        # The kitchen queue (app/utils/kitchen.py): only fired rows, in fire order
+        Index(
+            "ix_reservations_kitchen_queue",
+            "fired_at",
+            "id",
+            postgresql_where=text("status = 'fired'"),
+        ),
+        # Staff search (app/utils/search.py)
+        Index("ix_reservations_notes_trgm", "notes", postgresql_using="gin", postgresql_ops={"notes": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     dining_room_id: Mapped[int] = mapped_column(ForeignKey("dining_rooms.id"), nullable=False, index=True)
-    table_id: Mapped[int] = mapped_column(ForeignKey("table_entities.id"), nullable=False, index=True)
+    # NULL for room-level bookings until staff or the assigner (app/utils/table_assignment.py) picks one
+    table_id: Mapped[int | None] = mapped_column(ForeignKey("table_entities.id"), nullable=True, index=True)
 
     date: Mapped[date_type] = mapped_column(Date, nullable=False, index=True)
     meal_type: Mapped[str] = mapped_column(String(30), nullable=False)
     start_time: Mapped[time_type] = mapped_column(Time, nullable=False)
     end_time: Mapped[time_type] = mapped_column(Time, nullable=False)
+    # Generated by Postgres from date/start_time/end_time; never set it directly
+    booked_during: Mapped[Any] = mapped_column(
+        TSRANGE,
+        Computed("tsrange(date + start_time, date + end_time, '[)')", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
 
     status: Mapped[str] = mapped_column(
         String(30),
@@ -43,6 +75,9 @@ class Reservation(Base):
     )
 
     fired_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Maintained by triggers on reservation_attendees (migration b217f426cf92);
+    # read-only here, so lists get party_size without loading attendees.
+    attendee_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     
     # Changed to 'extra_data' to avoid SQLAlchemy Base.metadata collision
@@ -70,7 +105,7 @@ class Reservation(Base):
     # Added explicit foreign_keys where multiple columns point to the same table
     user: Mapped["User"] = relationship("User", foreign_keys=[user_id])
     dining_room: Mapped["DiningRoom"] = relationship("DiningRoom")
-    table: Mapped["TableEntity"] = relationship("TableEntity")
+    table: Mapped["TableEntity | None"] = relationship("TableEntity")
     
     order: Mapped["Order"] = relationship("Order", back_populates="reservation", uselist=False)
 
@@ -103,7 +138,7 @@ class Reservation(Base):
 
     @property
     def party_size(self) -> int:
-        return len(self.attendees)
+        return self.attendee_count
 
     @property
     def total_amount(self) -> Decimal:
@@ -4,7 +4,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime, timezone
 
-from sqlalchemy import ForeignKey, DateTime, String, func, JSON
+from sqlalchemy import Boolean, ForeignKey, DateTime, Index, String, func, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -18,6 +18,10 @@ if TYPE_CHECKING:
 
 class ReservationAttendee(Base):
     __tablename__ = "reservation_attendees"
+    __table_args__ = (
+        # Staff search (app/utils/search.py)
+        Index("ix_reservation_attendees_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -50,6 +54,13 @@ class ReservationAttendee(Base):
 
     dietary_restrictions: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
+    # Read by the seat assigner (app/utils/seat_assignment.py)
+    needs_accessible_seat: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+    # Tags matched against Seat.preferences keys / Seat.position, e.g. ["window", "high_chair"]
+    seat_preferences: Mapped[list | None] = mapped_column(JSON, nullable=True)
+
     created_by_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
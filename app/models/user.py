@@ -2,17 +2,20 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-import bcrypt
 
-from sqlalchemy import String, Integer, DateTime, JSON, CheckConstraint, ForeignKey
+from sqlalchemy import String, Integer, DateTime, JSON, CheckConstraint, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
+from app.utils.passwords import hash_password, verify_password
 
 class User(Base):
     __tablename__ = "users"
     __table_args__ = (
         CheckConstraint("role IN ('member','staff','admin')", name="ck_users_role"),
+        # Staff search (app/utils/search.py): pg_trgm GIN for ILIKE '%q%' and %>
+        Index("ix_users_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -51,11 +54,8 @@ class User(Base):
 
     def set_password(self, password: str) -> None:
         """Hashes the password and stores it in password_hash."""
-        hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-        self.password_hash = hashed.decode("utf-8")
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        """Verifies a password against the stored hash."""
-        if not self.password_hash:
-            return False
-        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("utf-8"))
\ No newline at end of file
+        """Verifies a password against the stored hash (blocking; see verify_password_async)."""
+        return verify_password(password, self.password_hash)
\ No newline at end of file
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.dining_room import DiningRoom
 from app.schemas.dining_room import DiningRoomCreate, DiningRoomUpdate, DiningRoomResponse
-from app.models.user import User
+from app.utils.principal_cache import Principal
 
 from app.utils.permissions import get_current_user, get_permission
 from app.utils.query_helpers import apply_permission_filter
@@ -16,7 +16,7 @@ router = APIRouter()
 def create_room(
     payload: DiningRoomCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "write")),
 ):
     if scope != "all":
@@ -46,7 +46,7 @@ def update_room(
     room_id: int,
     payload: DiningRoomUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "write")),
 ):
     if scope != "all":
@@ -74,7 +74,7 @@ def update_room(
 def delete_room(
     room_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "delete")),
 ):
     if scope != "all":
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.menu_item import MenuItem
 from app.schemas.menu_item import MenuItemCreate, MenuItemUpdate, MenuItemResponse
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.utils.permissions import get_current_user, get_permission
 
 router = APIRouter()
@@ -12,7 +12,7 @@ router = APIRouter()
 @router.get("", response_model=list[MenuItemResponse])
 def list_menu_items(
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "read")),
 ):
     if scope != "all":
@@ -24,7 +24,7 @@ def list_menu_items(
 def get_menu_item(
     item_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "read")),
 ):
     if scope != "all":
@@ -38,7 +38,7 @@ def get_menu_item(
 def create_menu_item(
     payload: MenuItemCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "write")),
 ):
     if scope != "all":
@@ -59,7 +59,7 @@ def update_menu_item(
     item_id: int,
     payload: MenuItemUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "write")),
 ):
     if scope != "all":
@@ -81,7 +81,7 @@ def update_menu_item(
 def delete_menu_item(
     item_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "delete")),
 ):
     if scope != "all":
@@ -7,8 +7,10 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.seat import Seat
-from app.schemas.seat import SeatResponse
-from app.utils.permissions import get_permission
+from app.schemas.seat import SeatResponse, SeatUpdate
+from app.utils.floor_events import publish
+from app.utils.principal_cache import Principal
+from app.utils.permissions import get_current_user, get_permission
 from app.utils import toast_responses
 
 # IMPORTANT:
@@ -31,3 +33,37 @@ def list_seats(
         .order_by(Seat.table_id.asc(), Seat.seat_number.asc())
         .all()
     )
+
+
+
+@router.patch("/{seat_id}", response_model=SeatResponse)
+def update_seat(
+    seat_id: int,
+    payload: SeatUpdate,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+    scope: str = Depends(get_permission("Seat", "write")),
+):
+    """Updates a seat (e.g. toggling is_available mid-service); pushed to live floor streams."""
+    if scope != "all":
+        return toast_responses.error_forbidden("Seat", "write")
+
+    seat = db.query(Seat).filter(Seat.id == seat_id).first()
+    if not seat:
+        return toast_responses.error_not_found("Seat", seat_id)
+
+    for key, value in payload.model_dump(exclude_unset=True).items():
+        setattr(seat, key, value)
+    seat.updated_by_user_id = user.id
+
+    db.flush()
+    publish(db, "seat.updated", None, {
+        "id": seat.id,
+        "table_id": seat.table_id,
+        "seat_number": seat.seat_number,
+        "is_available": seat.is_available,
+        "is_accessible": seat.is_accessible,
+    })
+    updated = SeatResponse.model_validate(seat)
+    db.commit()
+    return updated
@@ -1,8 +1,7 @@
 # app/routes/admin_tables.py
 from __future__ import annotations
-from typing import List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -11,16 +10,23 @@ from app.models.table_entity import TableEntity
 from app.models.seat import Seat
 from app.models.reservation import Reservation
 from app.schemas.table_entity import TableEntityCreate, TableEntityUpdate, TableEntityResponse
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.utils.permissions import get_current_user, get_permission
+from app.utils.availability import announce_change, availability_index
 from app.utils import toast_responses
+from app.utils.query_helpers import PageParams, apply_filters, apply_keyset, page_response
+from app.schemas.pagination import Page
 
 router = APIRouter(tags=["Admin - Tables"])
 
 POSITIONS = ["top", "right", "bottom", "left", "top-right", "bottom-right", "bottom-left", "top-left"]
 
-@router.get("", response_model=List[TableEntityResponse])
+TABLE_SORT = [(TableEntity.dining_room_id, "asc"), (TableEntity.table_number, "asc"), (TableEntity.id, "asc")]
+
+@router.get("", response_model=Page[TableEntityResponse])
 def list_tables(
+    dining_room_id: int | None = Query(None),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     scope: str = Depends(get_permission("Table", "read")),
 ):
@@ -28,18 +34,15 @@ def list_tables(
     if scope == "none":
         return toast_responses.error_forbidden("Table", "read")
         
-    return (
-        db.query(TableEntity)
-        .order_by(TableEntity.dining_room_id.asc(), TableEntity.table_number.asc())
-        .all()
-    )
+    q = apply_filters(db.query(TableEntity), {TableEntity.dining_room_id: dining_room_id})
+    return page_response(apply_keyset(q, TABLE_SORT, page).all(), TABLE_SORT, page)
 
 
 @router.post("", response_model=TableEntityResponse, status_code=status.HTTP_201_CREATED)
 def create_table(
     payload: TableEntityCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("Table", "write")),
 ):
     """Creates a table and automatically generates the associated seats."""
@@ -67,11 +70,13 @@ def create_table(
                 updated_by_user_id=user.id,
             ))
 
+        announce_change(db, None)
         db.commit()
     except IntegrityError:
         db.rollback()
         return toast_responses.error_server("Conflict: Table number already exists in this room.")
 
+    availability_index.evict()
     db.refresh(t)
     return t
 
@@ -81,7 +86,7 @@ def update_table(
     table_id: int,
     payload: TableEntityUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("Table", "write")),
 ):
     """Updates table metadata and syncs seat records if seat_count changed."""
@@ -121,11 +126,13 @@ def update_table(
                 db.delete(seat)
 
     try:
+        announce_change(db, None)
         db.commit()
     except IntegrityError:
         db.rollback()
         return toast_responses.error_server("Update failed: Table number conflict.")
 
+    availability_index.evict()
     db.refresh(t)
     return t
 
@@ -134,7 +141,7 @@ def update_table(
 def delete_table(
     table_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("Table", "delete")),
 ):
     """Deletes a table if it has no active reservations."""
@@ -151,5 +158,7 @@ def delete_table(
         return toast_responses.error_server("Cannot delete table: It has active reservations.")
 
     db.delete(t)
+    announce_change(db, None)
     db.commit()
+    availability_index.evict()
     return None
\ No newline at end of file
@@ -1,6 +1,5 @@
 # app/routes/admin_users.py
 from datetime import datetime, timezone
-from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Body, Request, Query, status
 from sqlalchemy.orm import Session
@@ -9,7 +8,10 @@ from app.database import get_db
 from app.models.user import User
 from app.models.activity_log import ActivityLog
 from app.schemas.user import UserResponse, UserUpdate, UserCreate, UserAdminUpdate
-from app.utils.permissions import load_acl, save_acl, get_current_user, get_permission
+from app.utils.permissions import load_acl, save_acl, get_current_user, get_permission, AclValidationError
+from app.utils.principal_cache import Principal, invalidate_principal
+from app.utils.query_helpers import PageParams, apply_filters, apply_keyset, page_response
+from app.schemas.pagination import Page
 
 router = APIRouter(tags=["Admin - Users"])
 
@@ -25,7 +27,7 @@ class UserCreateAdmin(UserCreate):
 def create_user(
     user_in: UserCreateAdmin,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("User", "write")),
 ):
     """Admin create user with specific role and status."""
@@ -46,15 +48,20 @@ def create_user(
     db.refresh(new_user)
     return new_user
 
-@router.get("/users", response_model=List[UserResponse])
+USER_SORT = [(User.created_at, "desc"), (User.id, "desc")]
+
+@router.get("/users", response_model=Page[UserResponse])
 def list_users(
+    role: str | None = Query(None),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     scope: str = Depends(get_permission("User", "read")),
 ):
     """Admin view of all users."""
     if scope != "all":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
-    return db.query(User).order_by(User.created_at.desc()).all()
+    q = apply_filters(db.query(User), {User.role: role})
+    return page_response(apply_keyset(q, USER_SORT, page).all(), USER_SORT, page)
 
 
 @router.patch("/users/{user_id}", response_model=UserResponse)
@@ -79,6 +86,7 @@ def update_user(
             setattr(target, field, val)
             
     db.commit()
+    invalidate_principal(user_id)
     db.refresh(target)
     return target
 
@@ -87,7 +95,7 @@ def update_user(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("User", "delete")),
 ):
     """Admin delete of a user. Cannot delete yourself."""
@@ -102,6 +110,7 @@ def delete_user(
     
     db.delete(target)
     db.commit()
+    invalidate_principal(user_id)
 
 
 # ── Role management ───────────────────────────────────────────────────
@@ -126,6 +135,7 @@ def set_user_role(
     
     target_user.role = role
     db.commit()
+    invalidate_principal(user_id)
     return {"ok": True, "new_role": role}
 
 
@@ -133,7 +143,7 @@ def set_user_role(
 @router.get("/permissions/matrix")
 def get_live_matrix(
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("User", "read")),
 ):
     if user.role != "admin" or scope != "all":
@@ -172,15 +182,18 @@ def update_matrix(
     request: Request,
     new_acl: dict = Body(...),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("User", "write")),
 ):
     if user.role != "admin" or scope != "all":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized")
-    save_acl(
-        db=db,
-        user_id=user.id,
-        new_acl=new_acl,
-        ip=request.client.host if request.client else "unknown",
-    )
+    try:
+        save_acl(
+            db=db,
+            user_id=user.id,
+            new_acl=new_acl,
+            ip=request.client.host if request.client else "unknown",
+        )
+    except AclValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return {"status": "success", "message": "ACL updated and logged"}
\ No newline at end of file
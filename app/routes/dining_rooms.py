@@ -11,7 +11,7 @@ from app.models.dining_room import DiningRoom
 from app.models.table_entity import TableEntity
 from app.schemas.dining_room import DiningRoomCreate, DiningRoomUpdate, DiningRoomResponse
 from app.schemas.table_entity import TableEntityResponse
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.utils.permissions import get_current_user, get_permission
 from app.utils import toast_responses
 
@@ -27,7 +27,7 @@ router = APIRouter(tags=["Dining Rooms"])
 def list_rooms(
     active_only: bool = Query(True),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "read")),
 ):
     """List all dining rooms."""
@@ -45,7 +45,7 @@ def list_rooms(
 def get_room(
     room_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "read")),
 ):
     """Fetch a single room layout."""
@@ -69,7 +69,7 @@ def get_room(
 def create_room(
     payload: DiningRoomCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "write")),
 ):
     """Admin only: Create a new dining room section."""
@@ -101,7 +101,7 @@ def update_room(
     room_id: int,
     payload: DiningRoomUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "write")),
 ):
     """Admin only: Update room metadata or status."""
@@ -131,7 +131,7 @@ def update_room(
 def delete_room(
     room_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "delete")),
 ):
     """Admin only: Remove a room."""
@@ -153,7 +153,7 @@ def delete_room(
 def get_room_tables(
     room_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("DiningRoom", "read")),
 ):
     """Fetch raw table list for a specific room layout."""
@@ -8,7 +8,7 @@ from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
 from app.models.member import Member
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.schemas.member import MemberCreate, MemberUpdate, MemberResponse
 from app.utils.auth import get_current_user
 from app.utils import toast_responses
@@ -20,7 +20,7 @@ router = APIRouter(tags=["members"])
 def create_member(
     payload: MemberCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """Adds a new family member or guest profile."""
     
@@ -69,7 +69,7 @@ def create_member(
 @router.get("", response_model=List[MemberResponse])
 def list_members(
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return db.query(Member).filter(Member.user_id == user.id).order_by(Member.id.asc()).all()
 
@@ -78,7 +78,7 @@ def list_members(
 def get_member(
     member_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     m = db.query(Member).filter(Member.id == member_id, Member.user_id == user.id).first()
     if not m:
@@ -91,7 +91,7 @@ def update_member(
     member_id: int,
     payload: MemberUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     m = db.query(Member).filter(Member.id == member_id, Member.user_id == user.id).first()
     if not m:
@@ -127,7 +127,7 @@ def update_member(
 def delete_member(
     member_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     m = db.query(Member).filter(Member.id == member_id, Member.user_id == user.id).first()
     if not m:
@@ -4,15 +4,17 @@ from __future__ import annotations
 from typing import Dict, List
 
 from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.menu_item import MenuItem
 from app.models.order_item import OrderItem
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.schemas.menu_item import MenuItemCreate, MenuItemResponse, MenuItemUpdate
-from app.utils.auth import get_current_user
-from app.utils.permissions import get_permission
+from app.utils.auth import get_current_user, get_current_user_async
+from app.utils.permissions import get_permission, get_permission_async
 from app.utils import toast_responses
 
 # IMPORTANT:
@@ -23,21 +25,22 @@ router = APIRouter(tags=["menu-items"])
 # ── READ ─────────────────────────────────────────────────────────────
 
 @router.get("/grouped", response_model=Dict[str, List[MenuItemResponse]])
-def get_grouped_menu(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-    scope: str = Depends(get_permission("MenuItem", "read")),
+async def get_grouped_menu(
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("MenuItem", "read")),
 ):
     """Returns available items grouped by category."""
     if scope == "none":
         return toast_responses.error_forbidden("MenuItem", "read")
 
     items = (
-        db.query(MenuItem)
-        .filter(MenuItem.is_available == True)  # noqa: E712
-        .order_by(MenuItem.category, MenuItem.display_order, MenuItem.name)
-        .all()
-    )
+        await db.scalars(
+            select(MenuItem)
+            .where(MenuItem.is_available == True)  # noqa: E712
+            .order_by(MenuItem.category, MenuItem.display_order, MenuItem.name)
+        )
+    ).all()
 
     grouped: Dict[str, List[MenuItem]] = {}
     for item in items:
@@ -52,7 +55,7 @@ def get_grouped_menu(
 def list_menu_items(
     available_only: bool = Query(False),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "read")),
 ):
     """List endpoint with optional availability filtering."""
@@ -70,7 +73,7 @@ def list_menu_items(
 def get_menu_item(
     item_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "read")),
 ):
     """Fetch a specific menu item."""
@@ -88,7 +91,7 @@ def get_menu_item(
 def create_menu_item(
     payload: MenuItemCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "write")),
 ):
     if scope != "all":
@@ -110,7 +113,7 @@ def update_menu_item(
     item_id: int,
     payload: MenuItemUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "write")),
 ):
     if scope != "all":
@@ -133,7 +136,7 @@ def update_menu_item(
 def delete_menu_item(
     item_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("MenuItem", "delete")),
 ):
     if scope != "all":
@@ -5,14 +5,15 @@ from datetime import datetime, timezone
 from typing import List
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.notification import Notification
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.schemas.notification import NotificationResponse
-from app.utils.auth import get_current_user
+from app.utils.auth import get_current_user, get_current_user_async
 from app.utils import toast_responses
 
 # IMPORTANT:
@@ -22,18 +23,17 @@ router = APIRouter(tags=["notifications"])
 
 
 @router.get("/unread-count")
-def get_unread_count(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
 ):
     """Efficient endpoint for the Navbar notification badge."""
-    count = (
-        db.query(func.count(Notification.id))
-        .filter(
+    count = await db.scalar(
+        select(func.count(Notification.id))
+        .where(
             Notification.user_id == user.id,
             Notification.read_at.is_(None),
         )
-        .scalar()
     )
     return {"count": int(count or 0)}
 
@@ -42,7 +42,7 @@ def get_unread_count(
 def get_my_notifications(
     unread_only: bool = True,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """Get the 20 most recent notifications for the logged-in user."""
     q = db.query(Notification).filter(Notification.user_id == user.id)
@@ -57,7 +57,7 @@ def get_my_notifications(
 def mark_as_read(
     notification_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """Mark a specific notification as read by timestamping read_at."""
     notif = (
@@ -82,7 +82,7 @@ def mark_as_read(
 @router.post("/read-all")
 def mark_all_read(
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """Batch mark all unread notifications as read."""
     now = datetime.now(timezone.utc)
@@ -4,22 +4,45 @@ from __future__ import annotations
 from datetime import date as date_type
 from typing import List
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload, selectinload
-
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, raiseload
+
+from app.config import settings
+from app.database import get_db, get_async_db, POOL_SIZE, MAX_OVERFLOW
 from app.models.user import User
 from app.models.reservation import Reservation
-from app.models.reservation_attendee import ReservationAttendee
 from app.models.table_entity import TableEntity
 from app.models.seat import Seat
 
-from app.utils.auth import get_current_user
-from app.utils.permissions import get_permission
+from app.utils.auth import get_current_user, get_current_user_async
+from app.utils.principal_cache import Principal, principal_cache
+from app.utils.permissions import get_permission, get_permission_async
+from app.utils.db_metrics import pool_snapshot, render_prometheus
+from app.utils.floor_snapshot import build_floor, encode_floor, floor_cache, floor_watermark
+from app.utils.attendee_feed import feed_query, stream_ndjson
+from app.utils.floor_events import event_stream, resume_token
+from app.utils.kitchen import kitchen_queue, kitchen_visible
+from app.utils.manifest import ManifestRejected, sync_manifest
+from app.utils.search import MIN_QUERY_LENGTH, search_query
+from app.utils.seat_assignment import assign_seats
+from app.utils.table_assignment import StalePlan, assign_tables
 from app.utils import toast_responses
-
+from app.utils.query_helpers import PageParams, apply_filters, apply_keyset, page_response
+
+from app.schemas.kitchen import KitchenQueueResponse
+from app.schemas.pagination import Page
+from app.schemas.search import SearchHit
+from app.schemas.table_assignment import (
+    SeatAssignmentRequest,
+    SeatAssignmentResponse,
+    TableAssignmentRequest,
+    TableAssignmentResponse,
+)
 from app.schemas.user_public import UserPublic
-from app.schemas.reservation import ReservationResponse
+from app.schemas.reservation import ReservationSummary
 from app.schemas.reservation_attendee import (
     ReservationAttendeeResponse,
     ReservationAttendeeSyncList,
@@ -36,10 +59,10 @@ router = APIRouter(tags=["Operations"])
 # ── FLOOR PLAN DATA (what your frontend is calling) ──────────────────
 
 @router.get("/tables", response_model=List[TableEntityResponse])
-def ops_list_tables(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-    scope: str = Depends(get_permission("Table", "read")),
+async def ops_list_tables(
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Table", "read")),
 ):
     """
     Staff floorplan needs tables.
@@ -49,21 +72,79 @@ def ops_list_tables(
         return toast_responses.error_forbidden("Table", "read_all")
 
     # Order by something stable
-    q = db.query(TableEntity)
-    # If these columns exist in your model (they usually do), keep them:
-    if hasattr(TableEntity, "dining_room_id") and hasattr(TableEntity, "table_number"):
-        q = q.order_by(TableEntity.dining_room_id.asc(), TableEntity.table_number.asc())
-    else:
-        q = q.order_by(TableEntity.id.asc())
+    q = select(TableEntity).order_by(
+        TableEntity.dining_room_id.asc(), TableEntity.table_number.asc()
+    )
+    return (await db.scalars(q)).all()
 
-    return q.all()
 
+SEAT_SORT = [(Seat.table_id, "asc"), (Seat.seat_number, "asc"), (Seat.id, "asc")]
 
-@router.get("/seats", response_model=List[SeatResponse])
-def ops_list_seats(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-    scope: str = Depends(get_permission("Seat", "read")),
+@router.get("/floor")
+async def ops_floor_snapshot(
+    request: Request,
+    date: date_type = Query(..., description="Service date, YYYY-MM-DD"),
+    meal_type: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Reservation", "read")),
+):
+    """
+    Everything the floor plan draws for one service in a single payload:
+    rooms -> tables -> seats + that day's reservations -> attendees.
+    Polls with a matching If-None-Match get 304 after one watermark query.
+    """
+    if scope != "all":
+        return toast_responses.error_forbidden("Reservation", "read_all")
+
+    etag = await floor_watermark(db, date, meal_type)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    key = (date, meal_type)
+    body = floor_cache.get(key, etag)
+    if body is None:
+        body = encode_floor(await build_floor(db, date, meal_type))
+        floor_cache.put(key, etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/stream")
+async def ops_floor_stream(
+    request: Request,
+    date: date_type | None = Query(None, description="Only events for this service date (plus floor-wide ones)"),
+    since: str | None = Query(None, max_length=2000, description="Resume token; EventSource sends Last-Event-ID itself"),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Reservation", "read")),
+):
+    """
+    Server-sent events for host stands: reservation created/updated/fired,
+    attendee syncs and seat changes, fanned out across workers by
+    LISTEN/NOTIFY. Reconnect with the last event id to get only what was
+    missed; fetch /api/ops/floor first for the initial state.
+    """
+    if scope != "all":
+        return toast_responses.error_forbidden("Reservation", "read_all")
+    # A stream lives for hours: never hold a pooled connection for it
+    await db.close()
+
+    wanted = date.isoformat() if date else None
+
+    def visible(event) -> bool:
+        return wanted is None or event["date"] in (None, wanted)
+
+    return event_stream(request, resume_token(request, since), visible)
+
+
+@router.get("/seats", response_model=Page[SeatResponse])
+async def ops_list_seats(
+    table_id: int | None = Query(None),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Seat", "read")),
 ):
     """
     Staff floorplan needs seats.
@@ -72,47 +153,153 @@ def ops_list_seats(
     if scope != "all":
         return toast_responses.error_forbidden("Seat", "read_all")
 
-    q = db.query(Seat)
-    # Order by table then seat number if available, otherwise by id
-    if hasattr(Seat, "table_id") and hasattr(Seat, "seat_number"):
-        q = q.order_by(Seat.table_id.asc(), Seat.seat_number.asc())
-    else:
-        q = q.order_by(Seat.id.asc())
+    q = apply_filters(select(Seat), {Seat.table_id: table_id})
+    rows = (await db.scalars(apply_keyset(q, SEAT_SORT, page))).all()
+    return page_response(rows, SEAT_SORT, page)
 
-    return q.all()
 
+RESERVATION_SUMMARY_COLUMNS = [
+    Reservation.id, Reservation.user_id, Reservation.dining_room_id, Reservation.table_id,
+    Reservation.date, Reservation.meal_type, Reservation.start_time, Reservation.end_time,
+    Reservation.status, Reservation.notes, Reservation.fired_at, Reservation.attendee_count,
+    Reservation.created_at, Reservation.updated_at,
+]
+RESERVATION_SORT = [(Reservation.date, "desc"), (Reservation.start_time, "asc"), (Reservation.id, "asc")]
 
-@router.get("/reservations", response_model=List[ReservationResponse])
-def ops_list_reservations(
+@router.get("/reservations", response_model=Page[ReservationSummary])
+async def ops_list_reservations(
     date: str | None = Query(None, description="YYYY-MM-DD"),
     status: str | None = Query(None),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-    scope: str = Depends(get_permission("Reservation", "read")),
+    dining_room_id: int | None = Query(None),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Reservation", "read")),
 ):
     """
     Staff view for managing all bookings.
     Frontend calls: GET /api/ops/reservations?date=YYYY-MM-DD
+    Rows are summaries (party_size, no attendees/messages); the floor
+    snapshot and PATCH /api/reservations/{id} return the full booking.
     """
     if scope != "all":
         return toast_responses.error_forbidden("Reservation", "read_all")
 
-    q = db.query(Reservation).options(
-        joinedload(Reservation.table),
-        selectinload(Reservation.attendees),
+    # One query, summary columns only; any relationship access raises
+    q = select(Reservation).options(
+        load_only(*RESERVATION_SUMMARY_COLUMNS),
+        raiseload("*"),
     )
 
-    if status:
-        q = q.filter(Reservation.status == status)
+    q = apply_filters(q, {
+        Reservation.status: status or None,
+        Reservation.dining_room_id: dining_room_id,
+    })
 
     if date:
         try:
             parsed_date = date_type.fromisoformat(date)
-            q = q.filter(Reservation.date == parsed_date)
+            q = q.where(Reservation.date == parsed_date)
         except ValueError:
             return toast_responses.error_validation("date", "Invalid date format", "Use YYYY-MM-DD")
 
-    return q.order_by(Reservation.date.desc(), Reservation.start_time.asc()).all()
+    rows = (await db.scalars(apply_keyset(q, RESERVATION_SORT, page))).all()
+    return page_response(rows, RESERVATION_SORT, page)
+
+
+# ── KITCHEN ──────────────────────────────────────────────────────────
+
+@router.get("/kitchen", response_model=KitchenQueueResponse)
+async def ops_kitchen_queue(
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Order", "read")),
+):
+    """
+    Fired tickets, oldest first, with order items summed per menu item.
+    Load it once, then follow /api/ops/kitchen/stream.
+    """
+    if scope != "all":
+        return toast_responses.error_forbidden("Order", "read_all")
+    return await kitchen_queue(db)
+
+
+@router.get("/kitchen/stream")
+async def ops_kitchen_stream(
+    request: Request,
+    since: str | None = Query(None, max_length=2000, description="Resume token; EventSource sends Last-Event-ID itself"),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Order", "read")),
+):
+    """
+    Server-sent events for kitchen displays: reservation.fired (the whole
+    ticket, items included) and reservation.updated when a status change
+    takes a ticket off the queue.
+    """
+    if scope != "all":
+        return toast_responses.error_forbidden("Order", "read_all")
+    await db.close()
+    return event_stream(request, resume_token(request, since), kitchen_visible)
+
+
+# ── TABLE & SEAT ASSIGNMENT ──────────────────────────────────────────
+
+@router.post("/assign-tables", response_model=TableAssignmentResponse)
+def ops_assign_tables(
+    payload: TableAssignmentRequest,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+    scope: str = Depends(get_permission("Reservation", "write")),
+):
+    """
+    Seats every room-level booking (no table yet) for one service: fewest
+    empty seats, no time overlaps, saved in one transaction.
+    dry_run=true returns the plan without writing it.
+    Also runnable before service: python -m app.assign_tables --help
+    """
+    if scope != "all":
+        return toast_responses.error_forbidden("Reservation", "assign_tables")
+
+    try:
+        plan = assign_tables(db, payload.date, payload.meal_type, payload.dining_room_id, payload.dry_run)
+    except StalePlan as e:
+        return toast_responses.error_assignment_stale(payload.date, payload.meal_type, e.changed)
+    except Exception as e:
+        db.rollback()
+        return toast_responses.error_server(f"Table assignment failed: {str(e)}")
+    return plan.summary(payload.dry_run)
+
+
+@router.post("/assign-seats", response_model=SeatAssignmentResponse)
+def ops_assign_seats(
+    payload: SeatAssignmentRequest,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+    scope: str = Depends(get_permission("ReservationAttendee", "write")),
+):
+    """
+    Seats the attendees of a service (or one room/table) in one pass:
+    accessible seats to guests who need them, each party in a contiguous
+    run of seat numbers, preferences where possible. One bulk UPDATE.
+    """
+    if scope != "all":
+        return toast_responses.error_forbidden("ReservationAttendee", "assign_seats")
+
+    try:
+        plan = assign_seats(
+            db, payload.date, payload.meal_type,
+            dining_room_id=payload.dining_room_id,
+            table_id=payload.table_id,
+            reseat=payload.reseat,
+            dry_run=payload.dry_run,
+        )
+    except StalePlan as e:
+        return toast_responses.error_assignment_stale(payload.date, payload.meal_type, e.changed)
+    except Exception as e:
+        db.rollback()
+        return toast_responses.error_server(f"Seat assignment failed: {str(e)}")
+    return plan.summary(payload.dry_run)
 
 
 # ── SYNC LOGIC (Manifest Reconciliation) ─────────────────────────────
@@ -125,7 +312,7 @@ def ops_sync_attendees(
     reservation_id: int,
     payload: ReservationAttendeeSyncList,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("ReservationAttendee", "write")),
 ):
     """Staff only: Reconciles the guest manifest (Add/Update/Delete)."""
@@ -136,71 +323,133 @@ def ops_sync_attendees(
     if not res:
         return toast_responses.error_not_found("Reservation", reservation_id)
 
-    existing_guests = (
-        db.query(ReservationAttendee)
-        .filter(ReservationAttendee.reservation_id == reservation_id)
-        .all()
-    )
-
-    existing_map = {g.id: g for g in existing_guests}
-    incoming_ids = [a.id for a in payload.attendees if a.id is not None]
-
-    # 1) DELETE removed
-    for g_id, guest in existing_map.items():
-        if g_id not in incoming_ids:
-            db.delete(guest)
-
-    # 2) UPDATE or CREATE
-    for a in payload.attendees:
-        if a.id and a.id in existing_map:
-            target = existing_map[a.id]
-            for key, value in a.model_dump(exclude={"id", "reservation_id"}).items():
-                setattr(target, key, value)
-        else:
-            db.add(
-                ReservationAttendee(
-                    **a.model_dump(exclude={"id"}),
-                    reservation_id=reservation_id,
-                    created_by_user_id=user.id,
-                )
-            )
-
     try:
+        manifest = sync_manifest(db, res, payload.attendees, user.id)
+        response = [ReservationAttendeeResponse.model_validate(a) for a in manifest]
         db.commit()
+    except ManifestRejected as e:
+        db.rollback()
+        return e.response
     except Exception as e:
         db.rollback()
         return toast_responses.error_server(f"Manifest sync failed: {str(e)}")
 
-    return (
-        db.query(ReservationAttendee)
-        .filter(ReservationAttendee.reservation_id == reservation_id)
-        .all()
-    )
+    return response
 
 
 # ── DIRECTORY & LISTINGS ─────────────────────────────────────────────
 
-@router.get("/users", response_model=List[UserPublic])
-def ops_list_users(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-    scope: str = Depends(get_permission("User", "read")),
+@router.get("/search", response_model=Page[SearchHit])
+async def ops_search(
+    q: str = Query(..., min_length=MIN_QUERY_LENGTH, max_length=100),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("Reservation", "read")),
+):
+    """
+    Find a guest or booking by user name/email, attendee name or reservation
+    notes (substring or close spelling), best match first.
+    Frontend calls: GET /api/ops/search?q=smith
+    """
+    if scope != "all":
+        return toast_responses.error_forbidden("Reservation", "read_all")
+
+    query, sort = search_query(q)
+    rows = (await db.execute(apply_keyset(query, sort, page))).all()
+    return page_response(rows, sort, page)
+
+
+USER_SORT = [(User.id, "desc")]
+
+@router.get("/users", response_model=Page[UserPublic])
+async def ops_list_users(
+    role: str | None = Query(None),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("User", "read")),
 ):
     """Staff directory view."""
     if scope != "all":
         return toast_responses.error_forbidden("User", "directory_access")
 
-    return db.query(User).order_by(User.id.desc()).all()
+    q = apply_filters(select(User), {User.role: role})
+    rows = (await db.scalars(apply_keyset(q, USER_SORT, page))).all()
+    return page_response(rows, USER_SORT, page)
 
 
-@router.get("/attendees", response_model=List[ReservationAttendeeResponse])
-def ops_list_all_attendees(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-    scope: str = Depends(get_permission("ReservationAttendee", "read")),
+@router.get("/attendees")
+async def ops_list_all_attendees(
+    request: Request,
+    date: date_type | None = Query(None, description="Service date, YYYY-MM-DD"),
+    meal_type: str | None = Query(None),
+    reservation_id: List[int] | None = Query(None, description="Repeatable: ?reservation_id=1&reservation_id=2"),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+    scope: str = Depends(get_permission_async("ReservationAttendee", "read")),
 ):
-    """Provides data for floor plan guest bubble population."""
+    """
+    Provides data for floor plan guest bubble population.
+    Frontend calls: GET /api/ops/attendees?date=YYYY-MM-DD
+    Streams NDJSON (one attendee per line, with the booking's date,
+    meal_type and table_id), grouped by reservation.
+    """
     if scope != "all":
         return toast_responses.error_forbidden("ReservationAttendee", "read_all")
+    if date is None and not reservation_id:
+        return toast_responses.error_validation(
+            "date", "A date or reservation_id is required", "Pass ?date=YYYY-MM-DD or ?reservation_id=<id>"
+        )
+    use_replica = db.sync_session.info.get("use_replica", False)
+    await db.close()
+
+    return StreamingResponse(
+        stream_ndjson(feed_query(date, meal_type, reservation_id), use_replica),
+        media_type="application/x-ndjson",
+    )
+
+
+# ── DIAGNOSTICS ──────────────────────────────────────────────────────
 
-    return db.query(ReservationAttendee).all()
+@router.get("/_auth-cache")
+def ops_auth_cache_stats(
+    user: Principal = Depends(get_current_user),
+):
+    """Admin only: principal cache size and hit/miss counters for scraping."""
+    if user.role != "admin":
+        return toast_responses.error_forbidden("AuthCache", "read")
+
+    return principal_cache.stats()
+
+@router.get("/_pool")
+def ops_pool_stats(
+    user: Principal = Depends(get_current_user),
+):
+    """Admin only: per-engine connection pool usage for this worker."""
+    if user.role != "admin":
+        return toast_responses.error_forbidden("DbPool", "read")
+
+    return {
+        "mode": settings.DB_POOL_MODE,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "web_concurrency": settings.WEB_CONCURRENCY,
+        "engines": pool_snapshot(),
+    }
+
+
+@router.get("/_metrics", response_class=PlainTextResponse)
+def ops_metrics(
+    user: Principal = Depends(get_current_user),
+):
+    """Admin only: pool and auth cache metrics in Prometheus text format."""
+    if user.role != "admin":
+        return toast_responses.error_forbidden("Metrics", "read")
+
+    cache = principal_cache.stats()
+    return render_prometheus(extra_gauges={
+        f"auth_principal_cache_{key}": value
+        for key, value in cache.items()
+        if isinstance(value, (int, float))
+    })
@@ -8,7 +8,7 @@ from app.database import get_db
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.schemas.order import OrderItemUpdate, OrderItemResponse
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.utils.permissions import get_current_user, get_permission
 from app.utils import toast_responses
 
@@ -22,7 +22,7 @@ def update_order_item(
     item_id: int,
     payload: OrderItemUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("Order", "write")),
 ):
     """Updates a specific item within an order (quantity, notes, etc.)."""
@@ -60,7 +60,7 @@ def update_order_item(
 def delete_order_item(
     item_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("Order", "delete")),
 ):
     """Removes an item from an order."""
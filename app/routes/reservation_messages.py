@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.reservation import Reservation
 from app.models.reservation_message import ReservationMessage
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.schemas.reservation_message import (
     ReservationMessageCreate,
     ReservationMessageResponse,
@@ -25,7 +25,7 @@ router = APIRouter(tags=["Messages"])
 def get_reservation_chat(
     reservation_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """Fetch message history for a reservation. Members cannot see internal notes."""
     res = db.query(Reservation).filter(Reservation.id == reservation_id).first()
@@ -54,7 +54,7 @@ def send_reservation_message(
     reservation_id: int,
     payload: ReservationMessageCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     """Send a new message. Staff can mark messages as internal."""
     res = db.query(Reservation).filter(Reservation.id == reservation_id).first()
@@ -1,98 +1,377 @@
 from __future__ import annotations
-from datetime import datetime, timezone, date as date_obj
-from typing import List
+from datetime import datetime, timezone, date as date_obj, time as time_obj
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.database import get_db
 from app.models.reservation import Reservation
 from app.models.reservation_attendee import ReservationAttendee
 from app.models.table_entity import TableEntity
-from app.models.user import User
-from app.schemas.reservation import ReservationCreate, ReservationUpdate, ReservationResponse
+from app.utils.principal_cache import Principal
+from app.schemas.reservation import (
+    ReservationCreate,
+    ReservationUpdate,
+    ReservationResponse,
+    ReservationBulkCreate,
+    ReservationBulkResult,
+    ReservationBulkResponse,
+)
+from app.schemas.table_entity import TableAvailabilityResponse
 from app.utils.auth import get_current_user
 from app.utils.permissions import get_permission
 from app.utils.query_helpers import apply_permission_filter
+from app.utils.kitchen import ticket_items
+from app.utils.floor_events import publish, reservation_event
+from app.utils.availability import (
+    INACTIVE_STATUSES,
+    TableDay,
+    announce_change,
+    announce_change_column,
+    availability_index,
+    default_end_time,
+    fits_in_day,
+    interval,
+    is_table_conflict,
+    search_cache,
+    search_free_tables,
+)
 from app.utils import toast_responses
 
 router = APIRouter(tags=["reservations"])
 
+# Every reservations column except the generated booked_during range
+RESERVATION_RETURNING = [c for c in Reservation.__table__.c if c.name != "booked_during"]
+
+def _attendee_rows(reservation_id: int, attendees, user_id: int) -> List[dict]:
+    """INSERT parameters for a reservation's attendees (create and bulk paths)."""
+    return [
+        dict(
+            reservation_id=reservation_id,
+            member_id=a.member_id,
+            seat_id=a.seat_id,
+            name=a.name or "Guest",
+            attendee_type=a.attendee_type or "member",
+            dietary_restrictions=a.dietary_restrictions,
+            needs_accessible_seat=a.needs_accessible_seat,
+            seat_preferences=a.seat_preferences,
+            created_by_user_id=user_id,
+        )
+        for a in attendees
+    ]
+
+def _no_room(start_time) -> toast_responses.ToastJSONResponse:
+    """400 toast for a start so late that the default end_time can't follow it."""
+    return toast_responses.error_validation(
+        field="start_time",
+        issue=f"A booking starting at {start_time.strftime('%H:%M')} has no time left before midnight.",
+        suggestion="Pick an earlier start time, or send an end_time after it.",
+    )
+
+def _end_not_after_start(start_time, end_time) -> toast_responses.ToastJSONResponse:
+    """400 toast for a sent end_time at or before start_time (the end_after_start CHECK)."""
+    return toast_responses.error_validation(
+        field="end_time",
+        issue=f"End time {end_time.strftime('%H:%M')} is not after the start time {start_time.strftime('%H:%M')}.",
+        suggestion="Send an end_time after the start, or leave it out for the standard booking length.",
+    )
+
+def _table_taken(db: Session, table: TableEntity, booking_date, meal_type, start_time, end_time, party_size, dining_room_id):
+    """409 toast listing the nearest free tables that fit the party."""
+    alternatives = availability_index.alternatives(
+        db, booking_date, start_time, end_time,
+        party_size=party_size,
+        dining_room_id=dining_room_id,
+        exclude_table_id=table.id,
+    )
+    return toast_responses.error_table_taken(
+        table.table_number,
+        booking_date,
+        meal_type,
+        [
+            {"table_id": t.id, "table_number": t.table_number, "dining_room_id": t.dining_room_id, "seat_count": t.seat_count}
+            for t in alternatives
+        ],
+    )
+
+@router.get("/availability", response_model=List[TableAvailabilityResponse])
+def search_availability(
+    date: date_obj = Query(...),
+    meal_type: str = Query("Dinner", max_length=30),
+    party_size: int = Query(1, ge=1),
+    dining_room_id: Optional[int] = Query(None),
+    start_time: Optional[time_obj] = Query(None),
+    end_time: Optional[time_obj] = Query(None),
+    db: Session = Depends(get_db),
+    scope: str = Depends(get_permission("Table", "read")),
+):
+    """
+    Free tables for a slot, smallest fit first. Cached per date and search
+    until a reservation on that date changes, so the booking modal can call
+    it on every keystroke.
+    """
+    if scope == "none":
+        return toast_responses.error_forbidden("Table", "read")
+
+    if start_time is not None and end_time is not None and end_time <= start_time:
+        return _end_not_after_start(start_time, end_time)
+    if start_time is not None and end_time is None:
+        if not fits_in_day(start_time):
+            return _no_room(start_time)
+        end_time = default_end_time(start_time)
+    elif start_time is None:
+        end_time = None
+
+    key = (dining_room_id, meal_type, party_size, start_time, end_time)
+    tables = search_cache.get(date, key)
+    if tables is None:
+        # Fill from the primary: a lagging replica would re-cache what a NOTIFY just evicted
+        db.info["use_replica"] = False
+        tables = search_free_tables(db, date, meal_type, party_size, dining_room_id, start_time, end_time)
+        search_cache.put(date, key, tables)
+    return tables
+
 @router.post("", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
 def create_reservation(
     payload: ReservationCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("Reservation", "write")),
 ):
     booking_date: date_obj = payload.date or payload.reservation_time.date()
     meal_type: str = payload.meal_type or "Dinner"
     start_time = payload.start_time or payload.reservation_time.time()
+    if payload.end_time is not None:
+        if payload.end_time <= start_time:
+            return _end_not_after_start(start_time, payload.end_time)
+        end_time = payload.end_time
+    elif fits_in_day(start_time):
+        end_time = default_end_time(start_time)
+    else:
+        return _no_room(start_time)
     
+    table = None
     if payload.table_id:
-        table = db.query(TableEntity).filter(TableEntity.id == payload.table_id).first()
+        # Cached by the availability index: no query once the date is warm
+        table = availability_index.table(db, booking_date, payload.table_id)
         if not table:
             return toast_responses.error_not_found("Table", payload.table_id)
+        if not availability_index.is_free(db, table.id, booking_date, start_time, end_time):
+            return _table_taken(
+                db, table, booking_date, meal_type, start_time, end_time,
+                party_size=max(payload.party_size, len(payload.attendees)),
+                dining_room_id=payload.dining_room_id,
+            )
 
     try:
-        # 1. Create Primary Reservation (REMOVED party_size assignment)
-        new_res = Reservation(
-            user_id=user.id,
-            dining_room_id=payload.dining_room_id,
-            table_id=payload.table_id,
-            date=booking_date,
-            meal_type=meal_type,
-            start_time=start_time,
-            end_time=payload.end_time or start_time,
-            notes=payload.notes,
-            status="confirmed",
-            created_by_user_id=user.id,
-        )
-        
-        db.add(new_res)
-        db.flush() 
-
-        # 2. Create Attendee Rows (This drives the @property party_size)
-        for a in payload.attendees:
-            db.add(
-                ReservationAttendee(
-                    reservation_id=new_res.id,
-                    name=a.name or "Guest",
-                    attendee_type=a.attendee_type or "member",
-                    dietary_restrictions=a.dietary_restrictions,
-                    created_by_user_id=user.id,
-                )
+        # 1. INSERT ... RETURNING inside a CTE, joined to its table and carrying
+        #    the availability NOTIFY: one round trip for the reservation row.
+        inserted = (
+            insert(Reservation.__table__)
+            .values(
+                user_id=user.id,
+                dining_room_id=payload.dining_room_id,
+                table_id=payload.table_id,
+                date=booking_date,
+                meal_type=meal_type,
+                start_time=start_time,
+                end_time=end_time,
+                notes=payload.notes,
+                status="confirmed",
+                created_by_user_id=user.id,
             )
+            .returning(*RESERVATION_RETURNING)
+            .cte("inserted")
+        )
+        row = db.execute(
+            select(inserted, TableEntity, announce_change_column(booking_date))
+            .select_from(inserted)
+            .outerjoin(TableEntity, TableEntity.id == inserted.c.table_id)
+        ).one()
+
+        # 2. All attendee rows in one multi-row INSERT ... RETURNING
+        attendees = []
+        if payload.attendees:
+            attendees = db.scalars(
+                insert(ReservationAttendee).returning(ReservationAttendee, sort_by_parameter_order=True),
+                _attendee_rows(row.id, payload.attendees, user.id),
+            ).all()
 
+        # Serialize before commit so nothing is refreshed or lazy-loaded after it
+        created = ReservationResponse.model_validate({
+            **row._mapping,
+            "table": row.TableEntity,
+            "attendees": attendees,
+            "messages": [],
+            "party_size": len(attendees),
+        })
+        publish(db, "reservation.created", booking_date, reservation_event(created))
         db.commit()
-        db.refresh(new_res)
-
-        # 3. Reload with relationships
-        created = (
-            db.query(Reservation)
-            .options(
-                joinedload(Reservation.table),
-                selectinload(Reservation.attendees),
-                selectinload(Reservation.messages),
-            )
-            .filter(Reservation.id == new_res.id)
-            .first()
-        )
+        availability_index.record(created)
         return created
 
+    except IntegrityError as e:
+        db.rollback()
+        if not is_table_conflict(e):
+            return toast_responses.error_server(str(e))
+        # Lost a race with another worker: the index missed their booking
+        availability_index.evict(booking_date)
+        return _table_taken(
+            db, table, booking_date, meal_type, start_time, end_time,
+            party_size=max(payload.party_size, len(payload.attendees)),
+            dining_room_id=payload.dining_room_id,
+        )
+
     except Exception as e:
         db.rollback()
         return toast_responses.error_server(str(e))
 
+# ── BULK IMPORT ──────────────────────────────────────────────────────
+
+def _plan_bulk(db: Session, rows: List[ReservationCreate], user_id: int):
+    """
+    Validates every row up front: table (if given) exists, slot free in the
+    index and not claimed by an earlier row of the same batch. Returns the per-row
+    results so far and the (index, values, attendees) still to insert.
+    """
+    results: dict[int, ReservationBulkResult] = {}
+    planned = []
+
+    table_ids = {r.table_id for r in rows if r.table_id}
+    known_tables = set(db.scalars(select(TableEntity.id).where(TableEntity.id.in_(table_ids)))) if table_ids else set()
+    claimed: dict[tuple, TableDay] = {}
+
+    for i, r in enumerate(rows):
+        booking_date = r.date or r.reservation_time.date()
+        start_time = r.start_time or r.reservation_time.time()
+        if r.end_time is not None:
+            if r.end_time <= start_time:
+                results[i] = ReservationBulkResult(index=i, status="error", table_id=r.table_id, detail="end_time must be after start_time")
+                continue
+            end_time = r.end_time
+        elif fits_in_day(start_time):
+            end_time = default_end_time(start_time)
+        else:
+            results[i] = ReservationBulkResult(index=i, status="error", table_id=r.table_id, detail="No time left before midnight")
+            continue
+
+        # No table_id: a room-level booking, seated later by POST /api/ops/assign-tables
+        if r.table_id:
+            if r.table_id not in known_tables:
+                results[i] = ReservationBulkResult(index=i, status="error", table_id=r.table_id, detail="Table not found")
+                continue
+
+            slot = interval(start_time, end_time)
+            batch_day = claimed.setdefault((r.table_id, booking_date), TableDay())
+            if batch_day.conflicts(*slot) or not availability_index.is_free(db, r.table_id, booking_date, start_time, end_time):
+                results[i] = ReservationBulkResult(index=i, status="conflict", table_id=r.table_id, detail="Table already taken")
+                continue
+            batch_day.add(-i - 1, *slot)
+
+        planned.append((
+            i,
+            dict(
+                user_id=user_id,
+                dining_room_id=r.dining_room_id,
+                table_id=r.table_id,
+                date=booking_date,
+                meal_type=r.meal_type or "Dinner",
+                start_time=start_time,
+                end_time=end_time,
+                notes=r.notes,
+                status="confirmed",
+                created_by_user_id=user_id,
+            ),
+            r.attendees,
+        ))
+
+    return results, planned
+
+def _insert_bulk(db: Session, planned, user_id: int) -> List[int]:
+    """Two multi-row INSERTs (reservations ... RETURNING id, then attendees)."""
+    ids = db.scalars(
+        insert(Reservation).returning(Reservation.id, sort_by_parameter_order=True),
+        [values for _, values, _ in planned],
+    ).all()
+
+    attendee_rows = [
+        row
+        for res_id, (_, _, attendees) in zip(ids, planned)
+        for row in _attendee_rows(res_id, attendees, user_id)
+    ]
+    if attendee_rows:
+        db.execute(insert(ReservationAttendee), attendee_rows)
+    return ids
+
+@router.post("/bulk", response_model=ReservationBulkResponse)
+def create_reservations_bulk(
+    payload: ReservationBulkCreate,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+    scope: str = Depends(get_permission("Reservation", "write")),
+):
+    """
+    Creates many reservations in one transaction. Rows that fail validation
+    are reported and skipped; the rest are inserted together.
+    """
+    if scope == "none":
+        return toast_responses.error_forbidden("Reservation", "write")
+
+    # A rival booking can still land between validation and INSERT; the
+    # exclusion constraint rejects the batch, so re-plan once on fresh data.
+    for attempt in range(2):
+        results, planned = _plan_bulk(db, payload.reservations, user.id)
+        dates = {values["date"] for _, values, _ in planned}
+        if not planned:
+            break
+        try:
+            ids = _insert_bulk(db, planned, user.id)
+            for day in dates:
+                announce_change(db, day)
+                publish(db, "reservations.created", day, {
+                    "reservations": [
+                        reservation_event({**values, "id": res_id, "party_size": len(attendees)})
+                        for (_, values, attendees), res_id in zip(planned, ids)
+                        if values["date"] == day
+                    ],
+                })
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if not is_table_conflict(e) or attempt == 1:
+                return toast_responses.error_server(str(e))
+            for day in dates:
+                availability_index.evict(day)
+            continue
+
+        for day in dates:
+            availability_index.evict(day)
+        for (i, values, _), res_id in zip(planned, ids):
+            results[i] = ReservationBulkResult(index=i, status="created", reservation_id=res_id, table_id=values["table_id"])
+        break
+
+    ordered = [results[i] for i in sorted(results)]
+    created = sum(1 for r in ordered if r.status == "created")
+    return ReservationBulkResponse(created=created, failed=len(ordered) - created, results=ordered)
+
 @router.patch("/{reservation_id}", response_model=ReservationResponse)
 def update_reservation(
     reservation_id: int,
     payload: ReservationUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     scope: str = Depends(get_permission("Reservation", "write")),
 ):
-    res = db.query(Reservation).filter(Reservation.id == reservation_id).first()
+    # Everything the response needs, loaded up front (attendees are lazy="selectin")
+    res = (
+        db.query(Reservation)
+        .options(joinedload(Reservation.table), selectinload(Reservation.messages))
+        .filter(Reservation.id == reservation_id)
+        .first()
+    )
     if not res:
         return toast_responses.error_not_found("Reservation", reservation_id)
     if scope == "own" and res.user_id != user.id:
@@ -101,12 +380,88 @@ def update_reservation(
     update_data = payload.model_dump(exclude_unset=True)
     update_data.pop("party_size", None) # Safety: Never try to update party_size directly
 
-    if update_data.get("status") == "fired" and res.status != "fired":
+    # Resolve a new table before touching anything: assigning res.table = None would clear table_id
+    new_table = None
+    if update_data.get("table_id") is not None:
+        new_table = db.get(TableEntity, update_data["table_id"])
+        if new_table is None:
+            return toast_responses.error_not_found("Table", update_data["table_id"])
+
+    newly_fired = update_data.get("status") == "fired" and res.status != "fired"
+    if newly_fired:
         res.fired_at = datetime.now(timezone.utc)
 
+    previous_date = res.date
+    was_active = res.status not in INACTIVE_STATUSES
+    slot_fields = {"date", "start_time", "end_time", "table_id"}
+    moves_slot = bool(slot_fields & update_data.keys())
+
     for key, value in update_data.items():
         setattr(res, key, value)
 
+    is_active = res.status not in INACTIVE_STATUSES
+    # A status change only matters to the index when the booking stops or starts holding its table
+    changes_hold = moves_slot or was_active != is_active
+
+    if update_data.get("end_time") is not None and res.end_time <= res.start_time:
+        db.rollback()
+        return _end_not_after_start(res.start_time, res.end_time)
+    # Only a moved start (or a cleared end) falls back to the standard length
+    if {"start_time", "end_time"} & update_data.keys() and (res.end_time is None or res.end_time <= res.start_time):
+        if not fits_in_day(res.start_time):
+            db.rollback()
+            return _no_room(res.start_time)
+        res.end_time = default_end_time(res.start_time)
+
+    if res.table_id and is_active and (moves_slot or not was_active):
+        if not availability_index.is_free(db, res.table_id, res.date, res.start_time, res.end_time, ignore_id=res.id):
+            table = availability_index.table(db, res.date, res.table_id)
+            if not table:
+                db.rollback()
+                return toast_responses.error_not_found("Table", res.table_id)
+            response = _table_taken(
+                db, table, res.date, res.meal_type, res.start_time, res.end_time,
+                party_size=res.party_size,
+                dining_room_id=res.dining_room_id,
+            )
+            db.rollback()
+            return response
+
+    if "table_id" in update_data:
+        res.table = new_table
+
+    try:
+        if changes_hold:
+            announce_change(db, res.date)
+            if previous_date != res.date:
+                announce_change(db, previous_date)
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        if not is_table_conflict(e):
+            return toast_responses.error_server(str(e))
+        new_date = update_data.get("date", previous_date)
+        availability_index.evict(new_date)
+        table = availability_index.table(db, new_date, update_data.get("table_id", res.table_id))
+        return toast_responses.error_table_taken(
+            table.table_number if table else 0,
+            new_date,
+            update_data.get("meal_type", res.meal_type),
+            [],
+        )
+
+    # Serialize before commit: no refresh, no post-commit lazy loads
+    updated = ReservationResponse.model_validate(res)
+    event = {**reservation_event(updated), "changed": sorted(update_data)}
+    if newly_fired:
+        # Kitchen displays render the ticket straight from the event
+        event.update(
+            table_number=res.table.table_number if res.table else None,
+            notes=res.notes,
+            items=ticket_items(db, res.id),
+        )
+    publish(db, "reservation.fired" if newly_fired else "reservation.updated", res.date, event)
     db.commit()
-    db.refresh(res)
-    return res
\ No newline at end of file
+    if changes_hold:
+        availability_index.record(updated, previous_date=previous_date)
+    return updated
\ No newline at end of file
@@ -1,12 +1,21 @@
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 import logging
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserLogin, TokenResponse
-from app.utils.auth import create_access_token, get_current_user, BLOCKED_STATUSES
+from app.utils.auth import create_access_token, get_current_user_record, BLOCKED_STATUSES
+from app.utils.login_tracker import last_login_buffer
+from app.utils.passwords import (
+    HashPoolSaturated,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+from app.utils.principal_cache import invalidate_principal
 
 # No prefix here; handled by app.include_router(users.router, prefix="/api/users") in main.py
 router = APIRouter(tags=["Users"])
@@ -14,13 +23,28 @@ router = APIRouter(tags=["Users"])
 # ── Public: no auth required ──────────────────────────────────────────
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: UserLogin, db: Session = Depends(get_db)):
+async def login(payload: UserLogin, db: Session = Depends(get_db)):
+    """
+    Async so bcrypt never occupies the shared threadpool: the hash check runs on
+    the dedicated, size-capped pool in app.utils.passwords.
+    """
     try:
         # 1. Fetch the user
-        user = db.query(User).filter(User.email == payload.email).first()
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == payload.email).first()
+        )
 
         # 2. Validate Credentials
-        if not user or not user.check_password(payload.password):
+        try:
+            valid = bool(user) and await verify_password_async(payload.password, user.password_hash)
+        except HashPoolSaturated:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many logins in progress. Please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+        if not user or not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
@@ -34,24 +58,32 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
                 detail=f"Account {user.membership_status}. Contact an administrator.",
             )
 
-        # 4. Update Persistence Logic
-        user.last_login_at = datetime.now(timezone.utc)
-        db.commit()
-        
-        # CRITICAL FIX: Refresh the object after commit.
-        # This keeps the attributes loaded so Pydantic can read them for TokenResponse.
-        db.refresh(user)
+        # 4. Build the response before any commit can expire the instance.
+        #    last_login_at is written behind by login_tracker, not here.
+        now = datetime.now(timezone.utc)
+        last_login_buffer.record(user.id, now)
+        user_out = UserResponse.model_validate(user).model_copy(update={"last_login_at": now})
+        access_token = create_access_token(user_id=user.id, role=user.role)
+
+        # 5. Transparent rehash when BCRYPT_ROUNDS changed (best effort under load).
+        #    This is the only case where login writes synchronously.
+        if needs_rehash(user.password_hash):
+            try:
+                user.password_hash = await hash_password_async(payload.password)
+                await run_in_threadpool(db.commit)
+            except HashPoolSaturated:
+                pass
         
         return {
-            "access_token": create_access_token(user_id=user.id, role=user.role),
+            "access_token": access_token,
             "token_type": "bearer",
-            "user": user,
+            "user": user_out,
         }
     except HTTPException:
         # Re-raise HTTP exceptions so they aren't caught by the general Exception block
         raise
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         logging.error(f"Login error: {e}")
         # Return the actual error string in dev to help debugging
         raise HTTPException(status_code=500, detail=str(e))
@@ -82,7 +114,7 @@ def create_user(user_in: UserCreate, db: Session = Depends(get_db)):
 # ── Authenticated: must be logged in ─────────────────────────────────
 
 @router.get("/me", response_model=UserResponse)
-def get_me(user: User = Depends(get_current_user)):
+def get_me(user: User = Depends(get_current_user_record)):
     """Returns the currently logged in user's own profile."""
     return user
 
@@ -91,7 +123,7 @@ def get_me(user: User = Depends(get_current_user)):
 def update_me(
     user_in: UserUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_record),
 ):
     """Allows a user to update their own profile only."""
     update_data = user_in.model_dump(exclude_unset=True)
@@ -111,5 +143,6 @@ def update_me(
             setattr(user, field, val)
     
     db.commit()
+    invalidate_principal(user.id)
     db.refresh(user)
     return user
\ No newline at end of file
@@ -19,7 +19,7 @@ from .table_entity import TableEntityCreate, TableEntityUpdate, TableEntityRespo
 from .seat import SeatCreate, SeatUpdate, SeatResponse
 
 # Reservation & Guest Schemas
-from .reservation import ReservationCreate, ReservationUpdate, ReservationResponse
+from .reservation import ReservationCreate, ReservationUpdate, ReservationResponse, ReservationSummary
 from .reservation_attendee import (
     ReservationAttendeeCreate,
     ReservationAttendeeUpdate,
@@ -40,6 +40,14 @@ from .order import (
     OrderResponse, 
     OrderWithItemsResponse
 )
+from .kitchen import KitchenItem, KitchenTicket, KitchenQueueResponse
+from .search import SearchHit
+from .table_assignment import (
+    TableAssignmentRequest,
+    TableAssignmentResponse,
+    SeatAssignmentRequest,
+    SeatAssignmentResponse,
+)
 
 # Financial & Admin Schemas
 from .reservation_total import ReservationTotalResponse
@@ -72,6 +80,7 @@ __all__ = [
     "ReservationCreate",
     "ReservationUpdate",
     "ReservationResponse",
+    "ReservationSummary",
     "ReservationAttendeeCreate",
     "ReservationAttendeeUpdate",
     "ReservationAttendeeResponse",
@@ -91,6 +100,14 @@ __all__ = [
     "OrderUpdate",
     "OrderResponse",
     "OrderWithItemsResponse",
+    "KitchenItem",
+    "KitchenTicket",
+    "KitchenQueueResponse",
+    "SearchHit",
+    "TableAssignmentRequest",
+    "TableAssignmentResponse",
+    "SeatAssignmentRequest",
+    "SeatAssignmentResponse",
     "ReservationTotalResponse",
     "NotificationCreate",
     "NotificationResponse",
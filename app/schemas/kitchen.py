@@ -0,0 +1,32 @@
+# app/schemas/kitchen.py
+from __future__ import annotations
+from datetime import datetime, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class KitchenItem(BaseModel):
+    # One menu item, quantities summed across the ticket's attendees
+    menu_item_id: int
+    name: str
+    quantity: int
+    special_instructions: List[str] = []
+
+
+class KitchenTicket(BaseModel):
+    reservation_id: int
+    dining_room_id: int
+    table_id: Optional[int] = None
+    table_number: Optional[int] = None
+    meal_type: str
+    start_time: time
+    fired_at: Optional[datetime] = None
+    party_size: int = 0
+    notes: Optional[str] = None
+    items: List[KitchenItem] = []
+
+
+class KitchenQueueResponse(BaseModel):
+    tickets: List[KitchenTicket]  # Oldest fire first
+    totals: List[KitchenItem]  # Per menu item across every open ticket
@@ -0,0 +1,14 @@
+# app/schemas/pagination.py
+from __future__ import annotations
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Keyset-paginated list envelope (see app/utils/query_helpers.apply_keyset)"""
+    items: List[T]
+    # Pass back as ?cursor= for the next page; None on the last page
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
 # app/schemas/reservation.py
 from __future__ import annotations
 from datetime import datetime, date, time
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.reservation_attendee import (
@@ -59,4 +59,39 @@ class ReservationResponse(ReservationBase):
     attendees: List[ReservationAttendeeResponse] = []
     messages: List[ReservationMessageResponse] = []
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class ReservationSummary(BaseModel):
+    # List rows: no table, attendees or messages (party_size is a column)
+    id: int
+    user_id: int
+    dining_room_id: int
+    table_id: Optional[int] = None
+    date: date
+    meal_type: str
+    start_time: time
+    end_time: time
+    status: str
+    notes: Optional[str] = None
+    fired_at: Optional[datetime] = None
+    party_size: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReservationBulkCreate(BaseModel):
+    # Catering events / block bookings: one request instead of one POST per table
+    reservations: List[ReservationCreate] = Field(..., min_length=1, max_length=1000)
+
+class ReservationBulkResult(BaseModel):
+    index: int  # Position in the submitted list
+    status: Literal["created", "conflict", "error"]
+    reservation_id: Optional[int] = None
+    table_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class ReservationBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ReservationBulkResult]
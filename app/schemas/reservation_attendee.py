@@ -25,6 +25,8 @@ class ReservationAttendeeCreate(BaseModel):
     attendee_type: Optional[str] = Field(None, max_length=20)
 
     dietary_restrictions: Optional[Dict[str, Any]] = None
+    needs_accessible_seat: bool = False
+    seat_preferences: Optional[List[str]] = None
     meta: Optional[Dict[str, Any]] = None
 
     @model_validator(mode="after")
@@ -48,6 +50,8 @@ class ReservationAttendeeUpdate(BaseModel):
     seat_id: Optional[int] = None
     attendee_type: Optional[str] = Field(None, max_length=20)
     dietary_restrictions: Optional[Dict[str, Any]] = None
+    needs_accessible_seat: Optional[bool] = None
+    seat_preferences: Optional[List[str]] = None
     meta: Optional[Dict[str, Any]] = None
 
 
@@ -59,6 +63,8 @@ class ReservationAttendeeResponse(BaseModel):
     name: str
     attendee_type: str
     dietary_restrictions: Optional[Dict[str, Any]] = None
+    needs_accessible_seat: bool = False
+    seat_preferences: Optional[List[str]] = None
     meta: Optional[Dict[str, Any]] = None
     created_by_user_id: Optional[int] = None
     created_at: datetime
@@ -0,0 +1,20 @@
+# app/schemas/search.py
+from __future__ import annotations
+from datetime import date as date_type
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SearchHit(BaseModel):
+    """One ranked match from GET /api/ops/search."""
+    kind: Literal["user", "attendee", "reservation"]
+    id: int
+    score: float  # pg_trgm word_similarity, 0..1
+    title: Optional[str] = None  # User/attendee name, or the reservation's notes
+    subtitle: Optional[str] = None  # Email, attendee type, or meal type
+    # Set for attendees and reservations: where the match takes staff
+    reservation_id: Optional[int] = None
+    date: Optional[date_type] = None
+
+    model_config = ConfigDict(from_attributes=True)
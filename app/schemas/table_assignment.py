@@ -0,0 +1,78 @@
+# app/schemas/table_assignment.py
+from __future__ import annotations
+from datetime import date as date_type, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class TableAssignmentRequest(BaseModel):
+    date: date_type
+    meal_type: str
+    dining_room_id: int
+    # True: return the plan without writing it
+    dry_run: bool = False
+
+
+class TableAssignment(BaseModel):
+    reservation_id: int
+    table_id: int
+    table_number: int
+    seat_count: int
+    party_size: int
+    start_time: time
+    end_time: time
+
+
+class UnassignedReservation(BaseModel):
+    reservation_id: int
+    party_size: int
+    start_time: time
+    reason: str
+
+
+class TableAssignmentResponse(BaseModel):
+    date: date_type
+    meal_type: str
+    dining_room_id: int
+    dry_run: bool
+    assigned: List[TableAssignment]
+    unassigned: List[UnassignedReservation]
+    wasted_seats: int  # Empty seats across the assigned tables
+    solve_ms: float
+
+
+class SeatAssignmentRequest(BaseModel):
+    date: date_type
+    meal_type: str
+    # Narrow the service to one room or one table (both optional)
+    dining_room_id: Optional[int] = None
+    table_id: Optional[int] = None
+    # True: move everyone; False: keep guests already in a valid seat
+    reseat: bool = False
+    dry_run: bool = False
+
+
+class SeatAssignment(BaseModel):
+    attendee_id: int
+    reservation_id: int
+    table_id: int
+    seat_id: int
+    seat_number: int
+    previous_seat_id: Optional[int] = None
+
+
+class UnseatedAttendee(BaseModel):
+    attendee_id: int
+    reservation_id: int
+    reason: str
+
+
+class SeatAssignmentResponse(BaseModel):
+    date: date_type
+    meal_type: str
+    dry_run: bool
+    assigned: List[SeatAssignment]
+    unseated: List[UnseatedAttendee]
+    changed: int  # Attendees whose seat_id was (or would be) written
+    solve_ms: float
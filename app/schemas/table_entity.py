@@ -42,4 +42,15 @@ class TableEntityResponse(TableEntityBase):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TableAvailabilityResponse(BaseModel):
+    """A table that is free for the searched slot (GET /api/reservations/availability)"""
+    id: int
+    dining_room_id: int
+    dining_room_name: str
+    table_number: int
+    seat_count: int
+
+    model_config = ConfigDict(from_attributes=True)
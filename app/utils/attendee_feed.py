@@ -0,0 +1,50 @@
+# app/utils/attendee_feed.py
+from __future__ import annotations
+
+import json
+from datetime import date as date_type
+from typing import AsyncIterator, List
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.reservation import Reservation
+from app.models.reservation_attendee import ReservationAttendee
+
+# Rows fetched per round trip from the server-side cursor (and per NDJSON chunk)
+FEED_BATCH = 1000
+
+# Every ReservationAttendeeResponse field, plus where the guest sits that day
+FEED_COLUMNS = [
+    *ReservationAttendee.__table__.c,
+    Reservation.date,
+    Reservation.meal_type,
+    Reservation.table_id,
+]
+
+
+def feed_query(day: date_type | None, meal_type: str | None, reservation_ids: List[int] | None):
+    """Attendees of one service date and/or a set of reservations, grouped by reservation."""
+    q = select(*FEED_COLUMNS).join(Reservation, Reservation.id == ReservationAttendee.reservation_id)
+    if day is not None:
+        q = q.where(Reservation.date == day)
+    if meal_type:
+        q = q.where(Reservation.meal_type == meal_type)
+    if reservation_ids:
+        q = q.where(ReservationAttendee.reservation_id.in_(reservation_ids))
+    return q.order_by(ReservationAttendee.reservation_id, ReservationAttendee.id)
+
+
+async def stream_ndjson(query, use_replica: bool) -> AsyncIterator[bytes]:
+    """
+    One JSON object per line, read through a server-side cursor (yield_per),
+    so memory holds one batch however many rows match. Opens its own
+    session: the request's is closed before the response body starts.
+    """
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info["use_replica"] = use_replica
+        result = await db.stream(query.execution_options(yield_per=FEED_BATCH))
+        async for batch in result.mappings().partitions():
+            lines = [json.dumps(jsonable_encoder(dict(row)), separators=(",", ":")) for row in batch]
+            yield ("\n".join(lines) + "\n").encode()
@@ -5,11 +5,14 @@ from typing import Dict, Any
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.user import User
+from app.utils.principal_cache import Principal, principal_cache
 
 security = HTTPBearer()
 
@@ -42,16 +45,8 @@ def decode_access_token(token: str) -> Dict[str, Any]:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """
-    FastAPI dependency that returns the authenticated User object.
-    Checks for validity, existence, and blocked status.
-    """
-    token = credentials.credentials
-    payload = decode_access_token(token)
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    payload = decode_access_token(credentials.credentials)
     
     user_id = payload.get("user_id")
     if not user_id:
@@ -59,19 +54,77 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Token missing user identification"
         )
+    return user_id
 
-    user = db.query(User).filter(User.id == user_id).first()
-
-    if user is None:
+def _remember_principal(row) -> Principal:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="User not found"
         )
+    principal = Principal.from_user(row)
+    principal_cache.put(principal)
+    return principal
 
-    if user.membership_status in BLOCKED_STATUSES:
+def _ensure_not_blocked(principal: Principal) -> Principal:
+    if principal.membership_status in BLOCKED_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Account is {user.membership_status}. Please contact support."
+            detail=f"Account is {principal.membership_status}. Please contact support."
         )
+    return principal
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    FastAPI dependency that returns the authenticated Principal.
+    Checks for validity, existence, and blocked status.
+    The users row is only read on a principal cache miss.
+    """
+    user_id = _token_user_id(credentials)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        row = (
+            db.query(User.id, User.role, User.membership_status, User.name)
+            .filter(User.id == user_id)
+            .first()
+        )
+        principal = _remember_principal(row)
+
+    return _ensure_not_blocked(principal)
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """Async counterpart of get_current_user for `async def` routes."""
+    user_id = _token_user_id(credentials)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        result = await db.execute(
+            select(User.id, User.role, User.membership_status, User.name)
+            .where(User.id == user_id)
+        )
+        principal = _remember_principal(result.first())
+
+    return _ensure_not_blocked(principal)
+
+def get_current_user_record(
+    principal: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> User:
+    """
+    FastAPI dependency for the few routes that need the full User row
+    (profile reads and self-service edits).
+    """
+    user = db.query(User).filter(User.id == principal.id).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="User not found"
+        )
     return user
\ No newline at end of file
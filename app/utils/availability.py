@@ -0,0 +1,465 @@
+# app/utils/availability.py
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date as date_type, time as time_type
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.dining_room import DiningRoom
+from app.models.reservation import Reservation, TABLE_OVERLAP_CONSTRAINT
+from app.models.table_entity import TableEntity
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel: payload "<worker token>:<ISO date>" or "<worker token>:*".
+# Every worker drops that date from its index and re-warms it on next use.
+AVAILABILITY_CHANNEL = "reservations_changed"
+
+# Reservations in these statuses no longer hold their table
+INACTIVE_STATUSES = frozenset({"cancelled"})
+
+DAY_MINUTES = 24 * 60
+
+# SQLSTATE exclusion_violation
+EXCLUSION_VIOLATION = "23P01"
+
+# Lets a worker ignore its own NOTIFYs (it already applied the change locally)
+_WORKER_TOKEN = uuid.uuid4().hex[:12]
+
+
+def to_minutes(t: time_type) -> int:
+    return t.hour * 60 + t.minute
+
+
+def fits_in_day(start: time_type) -> bool:
+    """False when no whole-minute end_time fits between start and midnight (23:59 onwards)."""
+    return to_minutes(start) < DAY_MINUTES - 1
+
+
+def default_end_time(start: time_type) -> time_type:
+    """
+    end_time for bookings that only send a start (RESERVATION_DEFAULT_DURATION_MINUTES),
+    capped at 23:59. Raises ValueError if the start leaves no room: check fits_in_day first.
+    """
+    if not fits_in_day(start):
+        raise ValueError(f"start time {start} leaves no room before midnight")
+    end = min(to_minutes(start) + settings.RESERVATION_DEFAULT_DURATION_MINUTES, DAY_MINUTES - 1)
+    return time_type(end // 60, end % 60)
+
+
+def interval(start: time_type, end: time_type | None) -> Tuple[int, int]:
+    """[start, end) in minutes. Zero-length or missing ends get the default duration."""
+    s = to_minutes(start)
+    e = to_minutes(end) if end is not None else s
+    if e <= s:
+        e = min(s + settings.RESERVATION_DEFAULT_DURATION_MINUTES, DAY_MINUTES)
+    return s, e
+
+
+@dataclass(frozen=True, slots=True)
+class TableInfo:
+    id: int
+    dining_room_id: int
+    table_number: int
+    seat_count: int
+
+
+class TableDay:
+    """
+    Bookings of one table on one date, sorted by start. max_end[i] is the
+    latest end among the first i+1 bookings (max_id[i] is whose it is, and
+    runner_up[i] the latest end among the others), so an overlap test is
+    one bisect, with or without a booking to ignore.
+    """
+
+    __slots__ = ("starts", "ends", "ids", "max_end", "max_id", "runner_up")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.ids: List[int] = []
+        self.max_end: List[int] = []
+        self.max_id: List[int] = []
+        self.runner_up: List[int] = []
+
+    def conflicts(self, start: int, end: int, ignore_id: int | None = None) -> bool:
+        # Only bookings starting before our end can overlap us
+        i = bisect.bisect_left(self.starts, end)
+        if i == 0:
+            return False
+        latest = self.runner_up[i - 1] if self.max_id[i - 1] == ignore_id else self.max_end[i - 1]
+        return latest > start
+
+    def add(self, res_id: int, start: int, end: int) -> None:
+        i = bisect.bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.ids.insert(i, res_id)
+        self._rebuild_max_end(i)
+
+    def remove(self, res_id: int) -> bool:
+        try:
+            i = self.ids.index(res_id)
+        except ValueError:
+            return False
+        del self.starts[i], self.ends[i], self.ids[i]
+        self._rebuild_max_end(i)
+        return True
+
+    def _rebuild_max_end(self, i: int) -> None:
+        del self.max_end[i:], self.max_id[i:], self.runner_up[i:]
+        best, best_id, second = (self.max_end[-1], self.max_id[-1], self.runner_up[-1]) if self.max_end else (0, -1, 0)
+        for end, res_id in zip(self.ends[i:], self.ids[i:]):
+            if end > best:
+                best, best_id, second = end, res_id, best
+            elif end > second:
+                second = end
+            self.max_end.append(best)
+            self.max_id.append(best_id)
+            self.runner_up.append(second)
+
+
+class Day:
+    """Everything the index knows about one service date."""
+
+    __slots__ = ("tables", "by_capacity", "capacities", "by_room", "bookings", "locations")
+
+    def __init__(self, tables: List[TableInfo]):
+        self.tables: Dict[int, TableInfo] = {t.id: t for t in tables}
+        # Sorted by (seat_count, room, number): bisect to the smallest table that fits
+        self.by_capacity = sorted(tables, key=lambda t: (t.seat_count, t.dining_room_id, t.table_number))
+        self.capacities = [t.seat_count for t in self.by_capacity]
+        # The same ordering per dining room, so a same-room search skips the other rooms
+        self.by_room: Dict[int, Tuple[List[TableInfo], List[int]]] = {}
+        for t in self.by_capacity:
+            room, caps = self.by_room.setdefault(t.dining_room_id, ([], []))
+            room.append(t)
+            caps.append(t.seat_count)
+        self.bookings: Dict[int, TableDay] = {}
+        # reservation id -> table id, so updates/cancels find the old slot
+        self.locations: Dict[int, int] = {}
+
+    def add(self, res_id: int, table_id: int, start: int, end: int) -> None:
+        self.remove(res_id)
+        self.bookings.setdefault(table_id, TableDay()).add(res_id, start, end)
+        self.locations[res_id] = table_id
+
+    def remove(self, res_id: int) -> None:
+        table_id = self.locations.pop(res_id, None)
+        if table_id is not None and table_id in self.bookings:
+            self.bookings[table_id].remove(res_id)
+
+    def is_free(self, table_id: int, start: int, end: int, ignore_id: int | None = None) -> bool:
+        booked = self.bookings.get(table_id)
+        return booked is None or not booked.conflicts(start, end, ignore_id)
+
+    def fitting(self, party_size: int, dining_room_id: int | None = None) -> List[TableInfo]:
+        """Tables (of one room, or all) seating party_size, smallest first."""
+        tables, caps = (self.by_capacity, self.capacities) if dining_room_id is None else self.by_room.get(dining_room_id, ([], []))
+        return tables[bisect.bisect_left(caps, party_size):]
+
+
+class SearchCache:
+    """
+    Results of GET /api/reservations/availability, grouped by date so a
+    booking change on that date drops every (room, meal_type, ...) entry at
+    once. The TTL only bounds staleness if a NOTIFY is ever missed. Fills
+    must come from the primary: a lagging replica would re-cache the state
+    the eviction just dropped. At most max_days dates are kept, least
+    recently used dropped first.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries_per_day: int = 2_000, max_days: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_day = max_entries_per_day
+        self.max_days = max_days
+        self._days: "OrderedDict[date_type, Dict[Hashable, Tuple[float, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, day: date_type, key: Hashable) -> Any | None:
+        with self._lock:
+            entries = self._days.get(day)
+            if entries is None:
+                return None
+            self._days.move_to_end(day)
+            hit = entries.get(key)
+        if hit is None or hit[0] < time.monotonic():
+            return None
+        return hit[1]
+
+    def put(self, day: date_type, key: Hashable, value: Any) -> None:
+        with self._lock:
+            entries = self._days.get(day)
+            if entries is None:
+                if len(self._days) >= self.max_days:
+                    self._days.popitem(last=False)
+                entries = self._days[day] = {}
+            else:
+                self._days.move_to_end(day)
+            if len(entries) >= self.max_entries_per_day:
+                entries.clear()
+            entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def evict(self, day: date_type | None = None) -> None:
+        with self._lock:
+            if day is None:
+                self._days.clear()
+            else:
+                self._days.pop(day, None)
+
+
+search_cache = SearchCache()
+
+
+class AvailabilityIndex:
+    """
+    Per-worker interval index of active reservations, keyed by date then table.
+    Dates are warmed from the database on first use (two queries) and kept
+    current by the reservation routes; other workers' changes arrive via
+    NOTIFY on AVAILABILITY_CHANNEL and simply evict the date.
+
+    The index is a fast pre-check, not a lock: two workers can still race
+    to the same slot, which the database must reject.
+    """
+
+    def __init__(self, max_days: int = 400):
+        self.max_days = max_days
+        self._days: Dict[date_type, Day] = {}
+        self._lock = threading.RLock()
+        # One gate per date being warmed: record()/evict() wait for the load
+        # to land before applying, so a change committed mid-load isn't lost
+        self._loading: Dict[date_type, threading.Lock] = {}
+
+    def _day(self, db: Session, day: date_type) -> Day:
+        with self._lock:
+            cached = self._days.get(day)
+            if cached is not None:
+                return cached
+            gate = self._loading.setdefault(day, threading.Lock())
+
+        with gate:
+            with self._lock:
+                cached = self._days.get(day)
+            if cached is not None:
+                return cached
+            loaded = self._load(db, day)
+            with self._lock:
+                if len(self._days) >= self.max_days:
+                    self._days.pop(next(iter(self._days)))
+                self._days[day] = loaded
+                # Left in place if the load failed: the next loader reuses it
+                if self._loading.get(day) is gate:
+                    del self._loading[day]
+            return loaded
+
+    def _load(self, db: Session, day: date_type) -> Day:
+        tables = [
+            TableInfo(*row)
+            for row in db.execute(
+                select(TableEntity.id, TableEntity.dining_room_id, TableEntity.table_number, TableEntity.seat_count)
+            )
+        ]
+        loaded = Day(tables)
+        rows = db.execute(
+            select(Reservation.id, Reservation.table_id, Reservation.start_time, Reservation.end_time)
+            .where(Reservation.date == day)
+            .where(Reservation.table_id.is_not(None))
+            .where(Reservation.status.not_in(INACTIVE_STATUSES))
+        )
+        for res_id, table_id, start, end in rows:
+            loaded.add(res_id, table_id, *interval(start, end))
+        return loaded
+
+    def _await_loads(self, days: set | None) -> None:
+        """
+        Blocks until in-flight warm-ups of `days` (None = every date) finish.
+        A load that read before the caller's commit is then patched by the
+        caller; one that read after already has the change. Day.add/remove
+        are idempotent, so both orders end up current.
+        """
+        with self._lock:
+            gates = [g for d, g in self._loading.items() if days is None or d in days]
+        for gate in gates:
+            with gate:
+                pass
+
+    # ── Queries ──
+
+    def is_free(
+        self,
+        db: Session,
+        table_id: int,
+        day: date_type,
+        start: time_type,
+        end: time_type | None,
+        ignore_id: int | None = None,
+    ) -> bool:
+        d = self._day(db, day)
+        with self._lock:
+            return d.is_free(table_id, *interval(start, end), ignore_id)
+
+    def alternatives(
+        self,
+        db: Session,
+        day: date_type,
+        start: time_type,
+        end: time_type | None,
+        party_size: int,
+        dining_room_id: int | None = None,
+        exclude_table_id: int | None = None,
+        limit: int = 3,
+    ) -> List[TableInfo]:
+        """
+        Up to `limit` tables free for the slot with at least party_size seats,
+        smallest fit first, same dining room before others.
+        """
+        d = self._day(db, day)
+        s, e = interval(start, end)
+        found: List[TableInfo] = []
+        with self._lock:
+            # The booking's own room first; other rooms only if it comes up short
+            for room in ([dining_room_id] if dining_room_id is not None else []) + [None]:
+                for t in d.fitting(party_size, room):
+                    if room is None and t.dining_room_id == dining_room_id:
+                        continue
+                    if t.id != exclude_table_id and d.is_free(t.id, s, e):
+                        found.append(t)
+                        if len(found) >= limit:
+                            return found
+        return found
+
+    def table(self, db: Session, day: date_type, table_id: int) -> Optional[TableInfo]:
+        return self._day(db, day).tables.get(table_id)
+
+    # ── Updates (call after commit) ──
+
+    def record(self, res: Any, previous_date: date_type | None = None) -> None:
+        """
+        Applies a created/updated/cancelled reservation to warm dates. Takes a
+        Reservation or anything with its id/date/table_id/status/times.
+        """
+        search_cache.evict(res.date)
+        if previous_date is not None:
+            search_cache.evict(previous_date)
+        self._await_loads({res.date, previous_date})
+        with self._lock:
+            if previous_date is not None and previous_date != res.date and previous_date in self._days:
+                self._days[previous_date].remove(res.id)
+            d = self._days.get(res.date)
+            if d is None:
+                return
+            if res.status in INACTIVE_STATUSES or res.table_id is None:
+                d.remove(res.id)
+            else:
+                d.add(res.id, res.table_id, *interval(res.start_time, res.end_time))
+
+    def evict(self, day: date_type | None = None) -> None:
+        """Drops one date (or everything, e.g. after table changes)."""
+        search_cache.evict(day)
+        self._await_loads(None if day is None else {day})
+        with self._lock:
+            if day is None:
+                self._days.clear()
+            else:
+                self._days.pop(day, None)
+
+
+availability_index = AvailabilityIndex()
+
+
+def search_free_tables(
+    db: Session,
+    day: date_type,
+    meal_type: str,
+    party_size: int,
+    dining_room_id: int | None = None,
+    start: time_type | None = None,
+    end: time_type | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Every table in an active room that seats the party and has no active
+    booking in the slot: one statement, table_entities anti-joined against
+    overlapping reservations. With a time window the slot is [start, end);
+    without one it is the whole meal_type service.
+    """
+    overlapping = (
+        select(Reservation.id)
+        .where(Reservation.table_id == TableEntity.id)
+        .where(Reservation.date == day)
+        .where(Reservation.status.not_in(INACTIVE_STATUSES))
+    )
+    if start is not None:
+        overlapping = overlapping.where(
+            Reservation.start_time < end,
+            # Legacy rows with end_time <= start_time count as running to close
+            or_(Reservation.end_time > start, Reservation.end_time <= Reservation.start_time),
+        )
+    else:
+        overlapping = overlapping.where(Reservation.meal_type == meal_type)
+
+    stmt = (
+        select(
+            TableEntity.id,
+            TableEntity.dining_room_id,
+            DiningRoom.name.label("dining_room_name"),
+            TableEntity.table_number,
+            TableEntity.seat_count,
+        )
+        .join(DiningRoom, DiningRoom.id == TableEntity.dining_room_id)
+        .where(DiningRoom.is_active.is_(True))
+        .where(TableEntity.seat_count >= party_size)
+        .where(~overlapping.exists())
+        .order_by(TableEntity.seat_count, DiningRoom.display_order, TableEntity.table_number)
+    )
+    if dining_room_id is not None:
+        stmt = stmt.where(TableEntity.dining_room_id == dining_room_id)
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def is_table_conflict(exc: IntegrityError) -> bool:
+    """True when the database rejected an overlapping booking (TABLE_OVERLAP_CONSTRAINT)."""
+    orig = exc.orig
+    if getattr(orig, "sqlstate", None) != EXCLUSION_VIOLATION:
+        return False
+    diag = getattr(orig, "diag", None)
+    return getattr(diag, "constraint_name", TABLE_OVERLAP_CONSTRAINT) == TABLE_OVERLAP_CONSTRAINT
+
+
+def announce_change_column(day: date_type | None):
+    """pg_notify(...) as a select column, to piggyback the NOTIFY on another statement."""
+    payload = f"{_WORKER_TOKEN}:{day.isoformat() if day else '*'}"
+    return func.pg_notify(AVAILABILITY_CHANNEL, payload).label("availability_notified")
+
+
+def announce_change(db: Session, day: date_type | None) -> None:
+    """
+    Queues a NOTIFY in the caller's transaction so other workers evict `day`
+    (None = every date) once it commits. Call before db.commit().
+    """
+    db.execute(select(announce_change_column(day)))
+
+
+def handle_availability_notify(payload: str | None) -> None:
+    """pg_listener callback. After a (re)connect (None) everything is evicted."""
+    if payload is None:
+        availability_index.evict()
+        return
+    token, _, day = payload.partition(":")
+    if token == _WORKER_TOKEN:
+        return
+    try:
+        # evict() also drops the date's search_cache entries
+        availability_index.evict(None if day == "*" else date_type.fromisoformat(day))
+    except ValueError:
+        logger.warning("Ignoring malformed %s payload: %r", AVAILABILITY_CHANNEL, payload)
@@ -0,0 +1,149 @@
+# app/utils/db_metrics.py
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Dict, List, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Checkout wait buckets, in milliseconds (upper bounds; +Inf is implicit)
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics), thread-safe."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+        # Keyed by Prometheus "le" label so the snapshot is also JSON-safe (no inf)
+        cumulative, running = [], 0
+        for le, n in zip([*(f"{b:g}" for b in self.buckets), "+Inf"], counts):
+            running += n
+            cumulative.append((le, running))
+        return {"buckets": cumulative, "count": running, "sum": round(total_sum, 3)}
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.checkout_wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.checkout_timeouts = 0
+        self.pre_ping_failures = 0
+
+
+# name -> engine; populated by instrument_engine()
+_registry: Dict[str, Engine] = {}
+
+
+def instrumented_pool_class(metrics: PoolMetrics, is_async: bool = False) -> Type[Pool]:
+    """
+    QueuePool subclass that times every checkout, including waits for a free
+    slot and new-connection setup. The metrics live on the class so they
+    survive pool.recreate() (engine.dispose()).
+    """
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return base._do_get(self)
+        except PoolTimeoutError:
+            self.metrics.checkout_timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait_ms.observe((time.perf_counter() - started) * 1000)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"metrics": metrics, "_do_get": _do_get})
+
+
+def instrument_engine(name: str, engine: Engine) -> Engine:
+    """
+    Registers an engine (built with an instrumented_pool_class pool) for
+    /api/ops/_pool and counts failed pre-pings. Pass async_engine.sync_engine
+    for async engines.
+    """
+    metrics: PoolMetrics = engine.pool.metrics  # type: ignore[attr-defined]
+    _registry[name] = engine
+
+    @event.listens_for(engine, "handle_error")
+    def _count_pre_ping_failure(context):
+        if context.is_pre_ping:
+            metrics.pre_ping_failures += 1
+
+    return engine
+
+
+def pool_snapshot() -> Dict[str, Dict]:
+    out: Dict[str, Dict] = {}
+    for name, engine in _registry.items():
+        pool = engine.pool
+        metrics: PoolMetrics = pool.metrics  # type: ignore[attr-defined]
+        out[name] = {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            "timeout_seconds": pool.timeout(),
+            "checkout_timeouts": metrics.checkout_timeouts,
+            "pre_ping_failures": metrics.pre_ping_failures,
+            "checkout_wait_ms": metrics.checkout_wait_ms.snapshot(),
+        }
+    return out
+
+
+def render_prometheus(extra_gauges: Dict[str, float] | None = None) -> str:
+    """Prometheus text exposition of every registered pool (plus optional gauges)."""
+    lines: List[str] = []
+    snap = pool_snapshot()
+
+    for metric, key in [
+        ("db_pool_size", "pool_size"),
+        ("db_pool_checked_out", "checked_out"),
+        ("db_pool_checked_in", "checked_in"),
+        ("db_pool_overflow", "overflow"),
+    ]:
+        lines.append(f"# TYPE {metric} gauge")
+        for name, s in snap.items():
+            lines.append(f'{metric}{{engine="{name}"}} {s[key]}')
+
+    for metric, key in [
+        ("db_pool_checkout_timeouts_total", "checkout_timeouts"),
+        ("db_pool_pre_ping_failures_total", "pre_ping_failures"),
+    ]:
+        lines.append(f"# TYPE {metric} counter")
+        for name, s in snap.items():
+            lines.append(f'{metric}{{engine="{name}"}} {s[key]}')
+
+    lines.append("# TYPE db_pool_checkout_wait_ms histogram")
+    for name, s in snap.items():
+        hist = s["checkout_wait_ms"]
+        for le, count in hist["buckets"]:
+            lines.append(f'db_pool_checkout_wait_ms_bucket{{engine="{name}",le="{le}"}} {count}')
+        lines.append(f'db_pool_checkout_wait_ms_sum{{engine="{name}"}} {hist["sum"]}')
+        lines.append(f'db_pool_checkout_wait_ms_count{{engine="{name}"}} {hist["count"]}')
+
+    for metric, value in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value}")
+
+    return "\n".join(lines) + "\n"
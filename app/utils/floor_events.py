@@ -0,0 +1,343 @@
+# app/utils/floor_events.py
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from datetime import date as date_type, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Set, Tuple
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models.floor_event import FloorEvent
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel: payload "<id> <txid> <event json>", or just "<id> <txid>"
+# when the event is too big for a NOTIFY (listeners then read it from floor_events).
+FLOOR_CHANNEL = "floor_events"
+MAX_NOTIFY_BYTES = 7000
+
+# Events per replay query (resume or gap)
+REPLAY_PAGE = 1000
+
+# Oldest transaction still running: every transaction below it has committed
+# (or aborted), so no event older than it can still appear.
+HORIZON_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+# Event ids a resume token may list before the stream catches up to a newer horizon
+MAX_PENDING = 100
+
+# Queued to a subscriber when events may have been dropped (listener
+# reconnect or a full queue): the stream replays from floor_events.
+GAP = object()
+
+
+# What a floor client needs to redraw one booking
+RESERVATION_EVENT_FIELDS = (
+    "id", "user_id", "dining_room_id", "table_id", "meal_type",
+    "start_time", "end_time", "status", "fired_at", "party_size",
+)
+
+
+def reservation_event(obj: Any) -> Dict[str, Any]:
+    """Compact event data from a Reservation, ReservationResponse or values dict."""
+    get = obj.get if isinstance(obj, dict) else (lambda f, d=None: getattr(obj, f, d))
+    return {f: get(f) for f in RESERVATION_EVENT_FIELDS}
+
+
+def publish(db: Session, event_type: str, service_date: date_type | None, data: Dict[str, Any]) -> None:
+    """
+    Appends an event and NOTIFYs it in the caller's transaction, in one
+    statement; nothing is sent unless the transaction commits. Call before
+    db.commit().
+    """
+    payload = json.dumps(jsonable_encoder(data), separators=(",", ":"))
+    event = json.dumps(
+        {"type": event_type, "date": service_date.isoformat() if service_date else None, "data": json.loads(payload)},
+        separators=(",", ":"),
+    )
+    header = "e.id::text || ' ' || e.txid::text"
+    notify = f"{header} || ' ' || :event" if len(event) <= MAX_NOTIFY_BYTES else header
+    db.execute(
+        text(
+            f"""
+            WITH e AS (
+                INSERT INTO floor_events (event_type, service_date, data)
+                VALUES (:event_type, :service_date, CAST(:data AS JSONB))
+                RETURNING id, txid
+            )
+            SELECT pg_notify(:channel, {notify}) FROM e
+            """
+        ),
+        {
+            "event_type": event_type,
+            "service_date": service_date,
+            "data": payload,
+            "event": event,
+            "channel": FLOOR_CHANNEL,
+        },
+    )
+
+
+def _as_event(row: FloorEvent) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "type": row.event_type,
+        "date": row.service_date.isoformat() if row.service_date else None,
+        "data": row.data,
+    }
+
+
+async def read_horizon() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(HORIZON_SQL)
+
+
+async def events_from(horizon: int, after_id: int = 0, limit: int = REPLAY_PAGE) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    One page of (txid, event) from transactions at or after `horizon`, by id.
+    Replay for resume tokens and gaps. Uses its own short-lived session.
+    """
+    async with AsyncSessionLocal() as db:
+        rows = await db.scalars(
+            select(FloorEvent)
+            .where(FloorEvent.txid >= horizon)
+            .where(FloorEvent.id > after_id)
+            .order_by(FloorEvent.id)
+            .limit(limit)
+        )
+        return [(r.txid, _as_event(r)) for r in rows]
+
+
+def prune_events() -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.FLOOR_EVENTS_RETENTION_HOURS)
+    with SessionLocal() as db:
+        deleted = db.execute(delete(FloorEvent).where(FloorEvent.created_at < cutoff)).rowcount
+        db.commit()
+    return deleted
+
+
+class FloorHub:
+    """
+    Per-worker fan-out from the pg_listener thread to the asyncio queues of
+    open /api/ops/stream connections.
+    """
+
+    def __init__(self, queue_size: int = 1000):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, item: Any) -> None:
+        # Runs on the event loop
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Slow client: drop what is queued and let it replay from the table
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(GAP)
+
+    def broadcast(self, item: Any) -> None:
+        """Thread-safe: called from the pg_listener thread."""
+        with self._lock:
+            loop, subscribers = self._loop, list(self._subscribers)
+        if loop is None or not subscribers:
+            return
+        for queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, item)
+
+
+floor_hub = FloorHub()
+
+
+def handle_floor_notify(payload: str | None) -> None:
+    """pg_listener callback: forward (txid, event) to the open streams."""
+    if payload is None:
+        floor_hub.broadcast(GAP)
+        return
+    parts = payload.split(" ", 2)
+    if len(parts) < 3:
+        # Event too large for NOTIFY: streams fetch it with their next replay
+        floor_hub.broadcast(GAP)
+        return
+    try:
+        event = json.loads(parts[2])
+        event["id"] = int(parts[0])
+        txid = int(parts[1])
+    except ValueError:
+        logger.warning("Ignoring malformed %s payload: %r", FLOOR_CHANNEL, payload[:200])
+        return
+    floor_hub.broadcast((txid, event))
+
+
+class ResumeToken:
+    """
+    What a stream has handled: every event from transactions below
+    `horizon`, plus the `seen` ids (event id -> txid, None until a replay
+    reads it) from transactions at or after it. Sent as the SSE id,
+    "x<horizon>" or "x<horizon>:<id>,<id>,...".
+    """
+
+    __slots__ = ("horizon", "seen")
+
+    def __init__(self, horizon: int, seen: Dict[int, int | None] | None = None):
+        self.horizon = horizon
+        self.seen: Dict[int, int | None] = seen or {}
+
+    @classmethod
+    def parse(cls, raw: str) -> "ResumeToken | None":
+        if not raw.startswith("x"):
+            return None
+        horizon, _, ids = raw[1:].partition(":")
+        try:
+            return cls(int(horizon), {int(i): None for i in ids.split(",") if i})
+        except ValueError:
+            return None
+
+    def encode(self) -> str:
+        ids = ",".join(str(i) for i in sorted(self.seen))
+        return f"x{self.horizon}:{ids}" if ids else f"x{self.horizon}"
+
+    def saw(self, event_id: int, txid: int) -> bool:
+        """Records an event; False if it was already handled."""
+        if txid < self.horizon or self.seen.get(event_id) is not None:
+            return False
+        fresh = event_id not in self.seen
+        self.seen[event_id] = txid
+        return fresh
+
+    def advance(self, horizon: int) -> None:
+        """After a full replay from the old horizon: forget ids below the new one."""
+        self.horizon = max(self.horizon, horizon)
+        self.seen = {i: t for i, t in self.seen.items() if t is not None and t >= self.horizon}
+
+
+def format_sse(event: Dict[str, Any], token: ResumeToken) -> str:
+    return f"id: {token.encode()}\nevent: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+def resume_token(request: Request, since: str | None) -> ResumeToken | None:
+    """?since= wins; otherwise the Last-Event-ID an EventSource sends on reconnect."""
+    raw = since if since is not None else request.headers.get("last-event-id") or ""
+    return ResumeToken.parse(raw)
+
+
+async def _replay(
+    token: ResumeToken,
+    visible: Callable[[Dict[str, Any]], bool],
+    deliver: bool = True,
+) -> AsyncIterator[str]:
+    """
+    SSE for every event from transactions at or after the token's horizon
+    not handled yet, a page at a time; then moves the horizon on.
+    deliver=False only marks them handled.
+    """
+    # Read the new horizon first: everything below it is visible to the pages after
+    horizon = await read_horizon()
+    batch = await events_from(token.horizon)
+    while batch:
+        for txid, event in batch:
+            if token.saw(event["id"], txid) and deliver and visible(event):
+                yield format_sse(event, token)
+        batch = await events_from(token.horizon, batch[-1][1]["id"]) if len(batch) >= REPLAY_PAGE else []
+    token.advance(horizon)
+
+
+def event_stream(
+    request: Request,
+    resume_from: ResumeToken | None,
+    visible: Callable[[Dict[str, Any]], bool],
+) -> StreamingResponse:
+    """
+    SSE response over floor_hub: live events, replayed from floor_events on
+    resume, after a GAP, and to move the resume token's horizon on, filtered
+    by `visible`. Holds no DB connection between replays.
+
+    Event ids are not commit-ordered (a lower id can commit later), so
+    nothing is skipped by id: replays read every event from transactions at
+    or after the token's horizon and drop the ones already handled.
+    """
+
+    async def events():
+        token = resume_from
+        if token is None:
+            # Fresh stream: what has already committed counts as handled. The
+            # replay after subscribing delivers whatever lands in between.
+            token = ResumeToken(await read_horizon())
+            async for _ in _replay(token, visible, deliver=False):
+                pass
+
+        # Subscribe before the first replay so nothing falls in between
+        queue = floor_hub.subscribe()
+        try:
+            replay = True
+            # Live events recorded since the last replay, and the token size that forces one.
+            # The limit backs off while a long transaction holds the horizon back.
+            dirty, pending_limit = False, MAX_PENDING
+            yield "retry: 3000\n\n"
+
+            while True:
+                if replay:
+                    async for chunk in _replay(token, visible):
+                        yield chunk
+                    replay, dirty = False, False
+                    pending_limit = max(MAX_PENDING, 2 * len(token.seen))
+                    # No data: updates the client's Last-Event-ID without dispatching an event
+                    yield f"id: {token.encode()}\n\n"
+
+                if await request.is_disconnected():
+                    return
+                try:
+                    item = await asyncio.wait_for(queue.get(), settings.FLOOR_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if dirty:
+                        # Idle: catch up so the token's id list shrinks (doubles as the heartbeat)
+                        replay = True
+                    else:
+                        yield ": ping\n\n"
+                    continue
+
+                if item is GAP:
+                    replay = True
+                    continue
+                txid, event = item
+                if token.saw(event["id"], txid):
+                    dirty = True
+                    if visible(event):
+                        yield format_sse(event, token)
+                if len(token.seen) >= pending_limit:
+                    replay = True
+        finally:
+            floor_hub.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
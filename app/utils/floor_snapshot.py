@@ -0,0 +1,147 @@
+# app/utils/floor_snapshot.py
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import date as date_type
+from typing import Any, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.dining_room import DiningRoom
+from app.models.floor_version import FloorVersion
+from app.models.reservation import Reservation
+from app.models.reservation_attendee import ReservationAttendee
+from app.models.seat import Seat
+from app.models.table_entity import TableEntity
+
+# Columns shipped to the floor plan (no audit fields, no JSON blobs it never reads)
+ROOM_COLUMNS = [DiningRoom.id, DiningRoom.name, DiningRoom.display_order, DiningRoom.is_active]
+TABLE_COLUMNS = [
+    TableEntity.id, TableEntity.dining_room_id, TableEntity.table_number,
+    TableEntity.seat_count, TableEntity.position_x, TableEntity.position_y,
+]
+SEAT_COLUMNS = [
+    Seat.id, Seat.table_id, Seat.seat_number, Seat.position,
+    Seat.is_accessible, Seat.is_available,
+]
+RESERVATION_COLUMNS = [
+    Reservation.id, Reservation.user_id, Reservation.dining_room_id, Reservation.table_id,
+    Reservation.meal_type, Reservation.start_time, Reservation.end_time,
+    Reservation.status, Reservation.fired_at, Reservation.notes,
+]
+ATTENDEE_COLUMNS = [
+    ReservationAttendee.id, ReservationAttendee.reservation_id, ReservationAttendee.member_id,
+    ReservationAttendee.seat_id, ReservationAttendee.name, ReservationAttendee.attendee_type,
+    ReservationAttendee.dietary_restrictions,
+]
+
+
+def _day_reservations(day: date_type, meal_type: str | None):
+    q = select(Reservation.id).where(Reservation.date == day)
+    if meal_type:
+        q = q.where(Reservation.meal_type == meal_type)
+    return q
+
+
+async def floor_watermark(db: AsyncSession, day: date_type, meal_type: str | None) -> str:
+    """
+    Strong ETag for a floor snapshot: the floor-wide and per-date
+    FloorVersion counters, in one statement. They advance in commit order,
+    so a snapshot built after reading them is never older than the tag.
+    """
+    scope = day.isoformat()
+    versions = dict(
+        (await db.execute(
+            select(FloorVersion.scope, FloorVersion.version).where(FloorVersion.scope.in_(["*", scope]))
+        )).all()
+    )
+    raw = f"{scope}|{meal_type or ''}|{versions.get('*', 0)}|{versions.get(scope, 0)}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+async def build_floor(db: AsyncSession, day: date_type, meal_type: str | None) -> Dict[str, Any]:
+    """
+    Rooms -> tables -> seats and that day's reservations -> attendees, from
+    five flat Core queries (no ORM objects, no relationship loading).
+    """
+    rooms = (await db.execute(select(*ROOM_COLUMNS).order_by(DiningRoom.display_order, DiningRoom.id))).mappings().all()
+    tables = (await db.execute(select(*TABLE_COLUMNS).order_by(TableEntity.table_number))).mappings().all()
+    seats = (await db.execute(select(*SEAT_COLUMNS).order_by(Seat.table_id, Seat.seat_number))).mappings().all()
+
+    res_q = select(*RESERVATION_COLUMNS).where(Reservation.date == day).order_by(Reservation.start_time, Reservation.id)
+    if meal_type:
+        res_q = res_q.where(Reservation.meal_type == meal_type)
+    reservations = (await db.execute(res_q)).mappings().all()
+
+    attendees = (
+        await db.execute(
+            select(*ATTENDEE_COLUMNS)
+            .where(ReservationAttendee.reservation_id.in_(_day_reservations(day, meal_type)))
+            .order_by(ReservationAttendee.reservation_id, ReservationAttendee.id)
+        )
+    ).mappings().all()
+
+    attendees_by_res: Dict[int, List[dict]] = defaultdict(list)
+    for a in attendees:
+        attendees_by_res[a["reservation_id"]].append(dict(a))
+
+    reservations_by_table: Dict[int | None, List[dict]] = defaultdict(list)
+    for r in reservations:
+        guests = attendees_by_res.get(r["id"], [])
+        reservations_by_table[r["table_id"]].append({**r, "party_size": len(guests), "attendees": guests})
+
+    seats_by_table: Dict[int, List[dict]] = defaultdict(list)
+    for s in seats:
+        seats_by_table[s["table_id"]].append(dict(s))
+
+    tables_by_room: Dict[int, List[dict]] = defaultdict(list)
+    for t in tables:
+        tables_by_room[t["dining_room_id"]].append({
+            **t,
+            "seats": seats_by_table.get(t["id"], []),
+            "reservations": reservations_by_table.get(t["id"], []),
+        })
+
+    return {
+        "date": day,
+        "meal_type": meal_type,
+        "rooms": [{**room, "tables": tables_by_room.get(room["id"], [])} for room in rooms],
+        # Bookings without a table yet (not shown on any table)
+        "unassigned": reservations_by_table.get(None, []),
+    }
+
+
+class FloorCache:
+    """Last encoded snapshot per (date, meal_type), reused while its ETag holds."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[date_type, str | None], Tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[date_type, str | None], etag: str) -> bytes | None:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None or hit[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return hit[1]
+
+    def put(self, key: Tuple[date_type, str | None], etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+floor_cache = FloorCache()
+
+
+def encode_floor(snapshot: Dict[str, Any]) -> bytes:
+    return json.dumps(jsonable_encoder(snapshot), separators=(",", ":")).encode()
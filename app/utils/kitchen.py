@@ -0,0 +1,108 @@
+# app/utils/kitchen.py
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.reservation import Reservation
+from app.models.table_entity import TableEntity
+
+# Fired and not yet moved on (completed, cancelled, ...): what the kitchen is cooking.
+# Served by the partial index ix_reservations_kitchen_queue.
+KITCHEN_STATUS = "fired"
+
+# Floor events a kitchen display cares about (see kitchen_visible)
+KITCHEN_EVENT_TYPES = {"reservation.fired", "reservation.updated"}
+
+
+def _queue_query():
+    return (
+        select(
+            Reservation.id.label("reservation_id"),
+            Reservation.dining_room_id,
+            Reservation.table_id,
+            TableEntity.table_number,
+            Reservation.meal_type,
+            Reservation.start_time,
+            Reservation.fired_at,
+            Reservation.attendee_count.label("party_size"),
+            Reservation.notes,
+        )
+        .outerjoin(TableEntity, TableEntity.id == Reservation.table_id)
+        .where(Reservation.status == KITCHEN_STATUS)
+        .order_by(Reservation.fired_at, Reservation.id)
+    )
+
+
+def _items_query(reservation_ids: Iterable[int]):
+    """Order items summed per (reservation, menu item), one row each."""
+    return (
+        select(
+            Order.reservation_id,
+            OrderItem.menu_item_id,
+            MenuItem.name,
+            func.sum(OrderItem.quantity).label("quantity"),
+            func.array_agg(OrderItem.special_instructions)
+            .filter(OrderItem.special_instructions.is_not(None))
+            .label("special_instructions"),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+        .where(Order.reservation_id.in_(list(reservation_ids)))
+        .group_by(Order.reservation_id, OrderItem.menu_item_id, MenuItem.name)
+        .order_by(Order.reservation_id, MenuItem.name)
+    )
+
+
+def _item(row) -> Dict[str, Any]:
+    return {
+        "menu_item_id": row.menu_item_id,
+        "name": row.name,
+        "quantity": int(row.quantity or 0),
+        "special_instructions": list(row.special_instructions or []),
+    }
+
+
+def _assemble(tickets, item_rows) -> Dict[str, Any]:
+    items_by_res: Dict[int, List[dict]] = defaultdict(list)
+    totals: Dict[int, dict] = {}
+    for row in item_rows:
+        item = _item(row)
+        items_by_res[row.reservation_id].append(item)
+        total = totals.setdefault(row.menu_item_id, {**item, "quantity": 0, "special_instructions": []})
+        total["quantity"] += item["quantity"]
+        total["special_instructions"] += item["special_instructions"]
+
+    return {
+        "tickets": [{**t, "items": items_by_res.get(t["reservation_id"], [])} for t in tickets],
+        # Queue-wide count per dish, busiest first
+        "totals": sorted(totals.values(), key=lambda i: (-i["quantity"], i["name"])),
+    }
+
+
+async def kitchen_queue(db: AsyncSession) -> Dict[str, Any]:
+    """Fired tickets oldest first, each with its items per menu item: two queries."""
+    tickets = (await db.execute(_queue_query())).mappings().all()
+    if not tickets:
+        return {"tickets": [], "totals": []}
+    item_rows = (await db.execute(_items_query(t["reservation_id"] for t in tickets))).all()
+    return _assemble(tickets, item_rows)
+
+
+def ticket_items(db: Session, reservation_id: int) -> List[Dict[str, Any]]:
+    """One ticket's items, for the reservation.fired event (sync write path)."""
+    return [_item(row) for row in db.execute(_items_query([reservation_id])).all()]
+
+
+def kitchen_visible(event: Dict[str, Any]) -> bool:
+    """Fires, plus status changes that take a ticket off (or back on) the queue."""
+    if event["type"] not in KITCHEN_EVENT_TYPES:
+        return False
+    return event["type"] == "reservation.fired" or "status" in event["data"].get("changed", [])
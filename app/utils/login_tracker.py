@@ -0,0 +1,101 @@
+# app/utils/login_tracker.py
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE ... FROM (VALUES ...) statement
+FLUSH_BATCH_SIZE = 1000
+
+
+class LastLoginBuffer:
+    """
+    Write-behind buffer for users.last_login_at.
+    Logins only record(); a background thread flushes every few seconds.
+    Only the newest timestamp per user is kept, so a burst collapses to one row.
+    """
+
+    def __init__(self, flush_seconds: float):
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record(self, user_id: int, at: datetime) -> None:
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None or at > current:
+                self._pending[user_id] = at
+
+    def flush(self) -> int:
+        """Writes everything buffered so far. Returns the number of users written."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        rows = list(batch.items())
+        try:
+            with engine.begin() as conn:
+                for i in range(0, len(rows), FLUSH_BATCH_SIZE):
+                    self._write(conn, rows[i:i + FLUSH_BATCH_SIZE])
+        except Exception as e:
+            logger.warning("last_login_at flush failed, will retry: %s", e)
+            for user_id, at in rows:
+                self.record(user_id, at)
+            return 0
+        return len(rows)
+
+    @staticmethod
+    def _write(conn, rows: List[Tuple[int, datetime]]) -> None:
+        values = ", ".join(
+            f"(CAST(:id_{i} AS INTEGER), CAST(:at_{i} AS TIMESTAMPTZ))" for i in range(len(rows))
+        )
+        params = {}
+        for i, (user_id, at) in enumerate(rows):
+            params[f"id_{i}"] = user_id
+            params[f"at_{i}"] = at
+
+        conn.execute(
+            text(
+                f"""
+                UPDATE users AS u
+                SET last_login_at = v.at
+                FROM (VALUES {values}) AS v(id, at)
+                WHERE u.id = v.id
+                  AND (u.last_login_at IS NULL OR u.last_login_at < v.at)
+                """
+            ),
+            params,
+        )
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="last-login-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.flush_seconds + 5)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+
+last_login_buffer = LastLoginBuffer(settings.LAST_LOGIN_FLUSH_SECONDS)
@@ -0,0 +1,201 @@
+# app/utils/manifest.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import cast, column, delete, insert, select, update, values
+from sqlalchemy.orm import Session
+
+from app.models.member import Member
+from app.models.order_item import OrderItem
+from app.models.reservation import Reservation
+from app.models.reservation_attendee import ReservationAttendee
+from app.schemas.reservation_attendee import ReservationAttendeeCreate
+from app.utils import toast_responses
+from app.utils.floor_events import publish
+from app.utils.toast_responses import ToastJSONResponse
+
+# What a sync may write, with the value a new attendee gets when it's not sent.
+# Every bulk row carries all of them so UPDATE/INSERT each go out as one batch.
+MANIFEST_FIELDS: Dict[str, Any] = {
+    "member_id": None,
+    "seat_id": None,
+    "name": None,
+    "attendee_type": None,
+    "dietary_restrictions": None,
+    "needs_accessible_seat": False,
+    "seat_preferences": None,
+}
+
+
+class ManifestRejected(Exception):
+    """The incoming manifest is invalid; `response` is the toast to return. Nothing was written."""
+
+    def __init__(self, response: ToastJSONResponse):
+        super().__init__(response.toast.why)
+        self.response = response
+
+
+def _normalize(
+    data: Dict[str, Any],
+    members: Dict[int, Any],
+    owner_id: int,
+    current: ReservationAttendee | None = None,
+) -> Dict[str, Any]:
+    """
+    Member attendees are filled from the member profile; guests need a name.
+    An update that doesn't send member_id keeps the attendee's current
+    member (or guest) status and only the fields it sends change.
+    """
+    if current is not None and "member_id" not in data:
+        if current.member_id is not None:
+            data["attendee_type"] = "member"
+        elif "name" in data and not data["name"]:
+            raise ManifestRejected(toast_responses.error_validation(
+                field="name",
+                issue="Guest requires a name.",
+                suggestion="Enter the name of your guest.",
+            ))
+        return data
+
+    member_id = data.get("member_id")
+    if member_id is not None:
+        member = members.get(member_id)
+        if member is None:
+            raise ManifestRejected(toast_responses.error_validation(
+                field="member_id",
+                issue="Profile not found.",
+                suggestion="Select a valid family member.",
+            ))
+        # Member must belong to the reservation owner
+        if member.user_id != owner_id:
+            raise ManifestRejected(toast_responses.error_forbidden("Member", "link_to_reservation"))
+        data.setdefault("name", member.name)
+        data["attendee_type"] = "member"
+        if data.get("dietary_restrictions") is None:
+            data["dietary_restrictions"] = member.dietary_restrictions
+    else:
+        data.setdefault("attendee_type", "guest")
+        if not data.get("name"):
+            raise ManifestRejected(toast_responses.error_validation(
+                field="name",
+                issue="Guest requires a name.",
+                suggestion="Enter the name of your guest.",
+            ))
+    return data
+
+
+def sync_manifest(
+    db: Session,
+    res: Reservation,
+    incoming: Sequence[ReservationAttendeeCreate],
+    user_id: int,
+) -> List[ReservationAttendee]:
+    """
+    Makes the reservation's attendees match `incoming`: attendees not listed
+    are deleted, listed ids are updated (only the fields sent), the rest are
+    inserted. A constant number of statements whatever the party size:
+    one read of the manifest, one IN query for referenced members, then at
+    most one bulk DELETE (plus the deleted guests' order items), one bulk
+    UPDATE ... FROM (VALUES ...) and its reload, one multi-row
+    INSERT ... RETURNING, and the floor
+    event. Returns the new manifest in incoming order, with nothing left to
+    refresh. Does not commit.
+    """
+    existing = {
+        a.id: a
+        for a in db.scalars(
+            select(ReservationAttendee).where(ReservationAttendee.reservation_id == res.id)
+        )
+    }
+
+    payloads = [a.model_dump(exclude_unset=True) for a in incoming]
+    member_ids = {p["member_id"] for p in payloads if p.get("member_id") is not None}
+    members = (
+        {m.id: m for m in db.execute(
+            select(Member.id, Member.user_id, Member.name, Member.dietary_restrictions)
+            .where(Member.id.in_(member_ids))
+        )}
+        if member_ids
+        else {}
+    )
+
+    keep_ids = {p["id"] for p in payloads if p.get("id") in existing}
+    delete_ids = sorted(existing.keys() - keep_ids)
+
+    updates: Dict[int, Dict[str, Any]] = {}
+    inserts: List[tuple[int, Dict[str, Any]]] = []
+    for position, payload in enumerate(payloads):
+        target_id = payload.get("id")
+        data = {k: v for k, v in payload.items() if k in MANIFEST_FIELDS}
+        if target_id in existing:
+            current = existing[target_id]
+            data = _normalize(data, members, res.user_id, current)
+            merged = {f: getattr(current, f) for f in MANIFEST_FIELDS}
+            merged.update(data)
+            if any(merged[f] != getattr(current, f) for f in MANIFEST_FIELDS):
+                updates[target_id] = {"id": target_id, **merged}
+        else:
+            row = {**MANIFEST_FIELDS, **_normalize(data, members, res.user_id)}
+            inserts.append((position, {**row, "reservation_id": res.id, "created_by_user_id": user_id}))
+
+    if delete_ids:
+        # Same as the ORM cascade on ReservationAttendee.order_items, in one statement
+        db.execute(delete(OrderItem).where(OrderItem.reservation_attendee_id.in_(delete_ids)))
+        db.execute(
+            delete(ReservationAttendee)
+            .where(ReservationAttendee.reservation_id == res.id)
+            .where(ReservationAttendee.id.in_(delete_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for attendee_id in delete_ids:
+            db.expunge(existing[attendee_id])
+
+    if updates:
+        # One UPDATE ... FROM (VALUES ...) for every changed attendee (updated_at via onupdate).
+        # Columns are cast back to their types: an all-NULL VALUES column comes out as text.
+        columns = ReservationAttendee.__table__.c
+        changed = values(
+            *(column(name, columns[name].type) for name in ("id", *MANIFEST_FIELDS)),
+            name="changed",
+        ).data([tuple(row[name] for name in ("id", *MANIFEST_FIELDS)) for row in updates.values()])
+        db.execute(
+            update(ReservationAttendee)
+            .where(ReservationAttendee.id == changed.c.id)
+            .where(ReservationAttendee.reservation_id == res.id)
+            .values({name: cast(changed.c[name], columns[name].type) for name in MANIFEST_FIELDS})
+            .execution_options(synchronize_session=False)
+        )
+
+    inserted: Dict[int, ReservationAttendee] = {}
+    if inserts:
+        rows = db.scalars(
+            insert(ReservationAttendee).returning(ReservationAttendee, sort_by_parameter_order=True),
+            [row for _, row in inserts],
+        ).all()
+        inserted = {position: row for (position, _), row in zip(inserts, rows)}
+
+    if updates:
+        # Bulk UPDATE by primary key leaves loaded objects as they were: reload them in one read
+        db.scalars(
+            select(ReservationAttendee)
+            .where(ReservationAttendee.id.in_(list(updates)))
+            .execution_options(populate_existing=True)
+        ).all()
+
+    manifest: List[ReservationAttendee] = []
+    seen = set()
+    for position, payload in enumerate(payloads):
+        attendee = inserted.get(position) or existing.get(payload.get("id"))
+        if attendee is not None and attendee.id not in seen:
+            seen.add(attendee.id)
+            manifest.append(attendee)
+
+    publish(db, "attendees.synced", res.date, {
+        "reservation_id": res.id,
+        "attendees": [
+            {"id": a.id, "name": a.name, "attendee_type": a.attendee_type, "seat_id": a.seat_id, "member_id": a.member_id}
+            for a in manifest
+        ],
+    })
+    return manifest
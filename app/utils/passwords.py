@@ -0,0 +1,77 @@
+# app/utils/passwords.py
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+import bcrypt
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# Dedicated pool: a burst of logins can only ever occupy these threads,
+# never the AnyIO threadpool shared by every sync route.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.LOGIN_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class HashPoolSaturated(Exception):
+    """Raised when LOGIN_MAX_PENDING hash jobs are already queued or running."""
+
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(password: str, password_hash: str | None) -> bool:
+    if not password_hash:
+        return False
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def hash_cost(password_hash: str) -> int | None:
+    """Cost factor of a modular-crypt bcrypt hash ('$2b$12$...'), or None if unparseable."""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(password_hash: str) -> bool:
+    return hash_cost(password_hash) != settings.BCRYPT_ROUNDS
+
+
+async def _run_bounded(fn: Callable[..., T], *args: Any) -> T:
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.LOGIN_MAX_PENDING:
+            raise HashPoolSaturated()
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+async def verify_password_async(password: str, password_hash: str | None) -> bool:
+    """Runs bcrypt.checkpw on the dedicated pool. Raises HashPoolSaturated when full."""
+    return await _run_bounded(verify_password, password, password_hash)
+
+
+async def hash_password_async(password: str) -> str:
+    """Runs bcrypt.hashpw on the dedicated pool. Raises HashPoolSaturated when full."""
+    return await _run_bounded(hash_password, password)
+
+
+def shutdown_hash_pool() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
@@ -1,19 +1,34 @@
 # app/utils/permissions.py
 from __future__ import annotations
+import logging
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
-from typing import Dict, Any, Literal
+from types import MappingProxyType
+from typing import Dict, Any, Literal, Mapping, Tuple
 
-from app.models.user import User
+from app.utils.principal_cache import Principal
 from app.models.system_setting import SystemSetting
 from app.models.activity_log import ActivityLog
-from app.utils.auth import get_current_user
-from app.database import get_db
+from app.utils.auth import get_current_user, get_current_user_async
+from app.database import get_db, get_async_db, SessionLocal
+
+logger = logging.getLogger(__name__)
 
 ACL_KEY = "permissions_matrix"
+ACL_VERSION_KEY = "permissions_matrix_version"
+
+# NOTIFY channel: every worker's pg_listener reloads the matrix on this.
+ACL_CHANNEL = "acl_changed"
 
 # Initialize with the default so it is NEVER None
 _ACL_CACHE: Dict[str, Any] = {}
+_ACL_TABLE: Mapping[Tuple[str, str, str], str] = MappingProxyType({})
+_ACL_VERSION: int = 0
+_ACL_RELOAD_LOCK = threading.Lock()
 
 DEFAULT_ACL = {
     "member": {
@@ -26,6 +41,7 @@ DEFAULT_ACL = {
         "Member": {"read": "own", "write": "own", "delete": "none"},
         "DiningRoom": {"read": "all", "write": "none", "delete": "none"},
         "Table": {"read": "all", "write": "none", "delete": "none"},
+        "Seat": {"read": "none", "write": "none", "delete": "none"},
         "ReservationMessage": {"read": "own", "write": "own", "delete": "none"},
         "DailyStat": {"read": "none", "write": "none", "delete": "none"},
         "AuditTrail": {"read": "none", "write": "none", "delete": "none"},
@@ -41,6 +57,7 @@ DEFAULT_ACL = {
         "Member": {"read": "all", "write": "all", "delete": "none"},
         "DiningRoom": {"read": "all", "write": "all", "delete": "none"},
         "Table": {"read": "all", "write": "all", "delete": "none"},
+        "Seat": {"read": "all", "write": "all", "delete": "none"},
         "ReservationMessage": {"read": "all", "write": "all", "delete": "none"},
         "DailyStat": {"read": "all", "write": "none", "delete": "none"},
         "AuditTrail": {"read": "none", "write": "none", "delete": "none"},
@@ -56,6 +73,7 @@ DEFAULT_ACL = {
         "Member": {"read": "all", "write": "all", "delete": "all"},
         "DiningRoom": {"read": "all", "write": "all", "delete": "all"},
         "Table": {"read": "all", "write": "all", "delete": "all"},
+        "Seat": {"read": "all", "write": "all", "delete": "all"},
         "ReservationMessage": {"read": "all", "write": "all", "delete": "all"},
         "DailyStat": {"read": "all", "write": "all", "delete": "all"},
         "AuditTrail": {"read": "all", "write": "all", "delete": "all"},
@@ -63,25 +81,85 @@ DEFAULT_ACL = {
     },
 }
 
+ACL_ROLES = frozenset(DEFAULT_ACL)
+ACL_ENTITIES = frozenset(DEFAULT_ACL["admin"])
+ACL_ACTIONS = frozenset({"read", "write", "delete"})
+ACL_SCOPES = frozenset({"all", "own", "none"})
+
+class AclValidationError(ValueError):
+    """Raised when a permissions matrix references unknown roles, entities, actions or scopes."""
+
+def compile_acl(acl: Dict[str, Any]) -> Mapping[Tuple[str, str, str], str]:
+    """
+    Flattens the nested matrix into a frozen (role, entity, action) -> scope table.
+    Entities missing from a role fall back to DEFAULT_ACL, so matrices saved before
+    an entity existed keep working. Only grants are stored; absent keys mean "none".
+    """
+    table: Dict[Tuple[str, str, str], str] = {}
+    for role, role_policy in acl.items():
+        if role not in ACL_ROLES:
+            raise AclValidationError(f"Unknown role '{role}'")
+        if not isinstance(role_policy, dict):
+            raise AclValidationError(f"Policy for role '{role}' must be an object")
+
+        unknown = set(role_policy) - ACL_ENTITIES
+        if unknown:
+            raise AclValidationError(f"Unknown entities for role '{role}': {sorted(unknown)}")
+
+        for entity in ACL_ENTITIES:
+            entity_policy = role_policy.get(entity, DEFAULT_ACL[role].get(entity, {}))
+            if not isinstance(entity_policy, dict):
+                raise AclValidationError(f"Policy for {role}.{entity} must be an object")
+
+            for action, scope in entity_policy.items():
+                if action not in ACL_ACTIONS:
+                    raise AclValidationError(f"Unknown action '{action}' for {role}.{entity}")
+                if scope not in ACL_SCOPES:
+                    raise AclValidationError(f"Unknown scope '{scope}' for {role}.{entity}.{action}")
+                if scope != "none":
+                    table[(role, entity, action)] = scope
+
+    return MappingProxyType(table)
+
 def load_acl(db: Session, force_refresh: bool = False) -> Dict[str, Any]:
     """Retrieves the ACL. Logic ensures a Dict is always returned."""
-    global _ACL_CACHE
+    global _ACL_CACHE, _ACL_TABLE, _ACL_VERSION
     
     # If cache is populated and we aren't forcing, return it
     if _ACL_CACHE and not force_refresh:
         return _ACL_CACHE
 
-    setting = db.query(SystemSetting).filter(SystemSetting.key == ACL_KEY).first()
+    settings_by_key = {
+        s.key: s.value
+        for s in db.query(SystemSetting)
+        .filter(SystemSetting.key.in_([ACL_KEY, ACL_VERSION_KEY]))
+        .all()
+    }
     
     # Prove to Pylance that result is a Dict
     result: Dict[str, Any] = DEFAULT_ACL
-    if setting and isinstance(setting.value, dict):
-        result = setting.value
+    table = compile_acl(DEFAULT_ACL)
+    stored = settings_by_key.get(ACL_KEY)
+    if isinstance(stored, dict):
+        try:
+            table = compile_acl(stored)
+            result = stored
+        except AclValidationError as e:
+            logger.error("Stored permissions matrix is invalid, using defaults: %s", e)
         
     _ACL_CACHE = result
+    _ACL_TABLE = table
+    _ACL_VERSION = int(settings_by_key.get(ACL_VERSION_KEY) or 0)
     return result
 
+def acl_version() -> int:
+    """Version of the matrix currently cached by this worker."""
+    return _ACL_VERSION
+
 def save_acl(db: Session, user_id: int, new_acl: Dict[str, Any], ip: str | None = None) -> None:
+    # Reject bad matrices before anything is written (raises AclValidationError)
+    compile_acl(new_acl)
+
     setting = db.query(SystemSetting).filter(SystemSetting.key == ACL_KEY).first()
     old_acl = setting.value if setting else None
 
@@ -91,6 +169,23 @@ def save_acl(db: Session, user_id: int, new_acl: Dict[str, Any], ip: str | None
 
     setting.value = new_acl
     setting.updated_by_user_id = user_id
+
+    # Monotonic version, row-locked so concurrent saves serialize
+    version_row = (
+        db.query(SystemSetting)
+        .filter(SystemSetting.key == ACL_VERSION_KEY)
+        .with_for_update()
+        .first()
+    )
+    if not version_row:
+        version_row = SystemSetting(
+            key=ACL_VERSION_KEY,
+            description="Bumped on every permissions matrix save; broadcast via NOTIFY",
+        )
+        db.add(version_row)
+    new_version = int(version_row.value or 0) + 1
+    version_row.value = new_version
+    version_row.updated_by_user_id = user_id
     db.flush() 
 
     log = ActivityLog(
@@ -99,36 +194,91 @@ def save_acl(db: Session, user_id: int, new_acl: Dict[str, Any], ip: str | None
         resource_type="system_settings",
         details={
             "description": "Permission matrix updated via Admin Dashboard",
+            "version": new_version,
             "old_snapshot": old_acl,
             "new_snapshot": new_acl,
         },
         ip_address=ip,
     )
     db.add(log)
+
+    # NOTIFY is transactional: other workers only hear it once we commit
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": ACL_CHANNEL, "payload": str(new_version)},
+    )
     db.commit()
     
     # Invalidate cache
     load_acl(db, force_refresh=True)
 
+def handle_acl_notify(payload: str | None) -> None:
+    """
+    pg_listener callback. Reloads the matrix when a newer version is announced,
+    or unconditionally after a (re)connect (payload None).
+    """
+    if payload is not None:
+        try:
+            if int(payload) <= _ACL_VERSION:
+                return
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload: %r", ACL_CHANNEL, payload)
+            return
+
+    with _ACL_RELOAD_LOCK:
+        db = SessionLocal()
+        try:
+            load_acl(db, force_refresh=True)
+        finally:
+            db.close()
+
+def _validate_permission_args(entity: str, action: str) -> None:
+    # Validated when routes are declared, so a typo fails at import, not per request
+    if entity not in ACL_ENTITIES:
+        raise AclValidationError(f"get_permission: unknown entity '{entity}'")
+    if action not in ACL_ACTIONS:
+        raise AclValidationError(f"get_permission: unknown action '{action}'")
+
+def _lookup_scope(user: Principal, entity: str, action: str) -> Literal["all", "own"]:
+    scope = _ACL_TABLE.get((user.role, entity, action), "none")
+
+    if scope == "none":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Insufficient permissions for {entity}:{action}",
+        )
+    
+    return scope # type: ignore
+
 def get_permission(entity: str, action: str):
+    _validate_permission_args(entity, action)
+
     def dependency(
-        user: User = Depends(get_current_user),
+        user: Principal = Depends(get_current_user),
         db: Session = Depends(get_db),
     ) -> Literal["all", "own"]:
         if user.role == "admin":
             return "all"
 
-        acl = load_acl(db)
-        role_policy: Dict[str, Any] = acl.get(user.role, {})
-        entity_policy: Dict[str, Any] = role_policy.get(entity, {})
-        scope = entity_policy.get(action, "none")
+        if not _ACL_CACHE:
+            load_acl(db)
+        return _lookup_scope(user, entity, action)
 
-        if scope == "none":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions for {entity}:{action}",
-            )
-        
-        return scope # type: ignore
+    return dependency
+
+def get_permission_async(entity: str, action: str):
+    """Async counterpart of get_permission for `async def` routes."""
+    _validate_permission_args(entity, action)
+
+    async def dependency(
+        user: Principal = Depends(get_current_user_async),
+        db: AsyncSession = Depends(get_async_db),
+    ) -> Literal["all", "own"]:
+        if user.role == "admin":
+            return "all"
+
+        if not _ACL_CACHE:
+            await db.run_sync(load_acl)
+        return _lookup_scope(user, entity, action)
 
     return dependency
\ No newline at end of file
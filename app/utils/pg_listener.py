@@ -0,0 +1,78 @@
+# app/utils/pg_listener.py
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import psycopg
+
+from app.config import settings
+from app.database import libpq_url
+
+logger = logging.getLogger(__name__)
+
+# Callbacks receive the NOTIFY payload, or None right after (re)connecting,
+# meaning "notifications may have been missed, resync from the database".
+NotifyCallback = Callable[[str | None], None]
+
+
+class PgListener:
+    """
+    One background thread per worker holding a dedicated LISTEN connection.
+    Channels are dispatched to callbacks registered with subscribe().
+    """
+
+    def __init__(self, dsn: str, poll_seconds: float = 1.0, retry_seconds: float = 2.0):
+        self.dsn = dsn
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self._subscribers: Dict[str, List[NotifyCallback]] = defaultdict(list)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, channel: str, callback: NotifyCallback) -> None:
+        """Register a callback. Must be called before start()."""
+        self._subscribers[channel].append(callback)
+
+    def start(self) -> None:
+        if self._thread is not None or not self._subscribers:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _dispatch(self, channel: str, payload: str | None) -> None:
+        for callback in self._subscribers.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("pg-listener callback failed for channel %s", channel)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    for channel in self._subscribers:
+                        conn.execute(f'LISTEN "{channel}"')
+
+                    # Anything sent while we were disconnected is lost: resync.
+                    for channel in self._subscribers:
+                        self._dispatch(channel, None)
+
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=self.poll_seconds):
+                            self._dispatch(notify.channel, notify.payload)
+            except Exception as e:
+                logger.warning("pg-listener connection lost: %s", e)
+                self._stop.wait(self.retry_seconds)
+
+
+pg_listener = PgListener(libpq_url(settings.DATABASE_URL))
@@ -0,0 +1,97 @@
+# app/utils/query_counter.py
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper, RelationshipProperty, registry as Registry
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time"
+
+
+class QueryStats:
+    """SQL statements and DB time for one request."""
+
+    __slots__ = ("count", "elapsed_ms", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed_ms = 0.0
+        self.statements: Counter = Counter()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least `threshold` times: the usual N+1 signature."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+# Set by the middleware in main.py. The object is mutable, so threadpool (sync
+# routes) and greenlet (AsyncSession) executions see the same instance.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def report(route: str, stats: QueryStats) -> None:
+    """Logs requests over the query/time budget and statements that look like N+1s."""
+    if stats.count > settings.DB_QUERY_BUDGET or stats.elapsed_ms > settings.DB_TIME_BUDGET_MS:
+        logger.warning(
+            "%s ran %d queries in %.1f ms (budget %d queries / %.0f ms)",
+            route, stats.count, stats.elapsed_ms,
+            settings.DB_QUERY_BUDGET, settings.DB_TIME_BUDGET_MS,
+        )
+    for sql, n in stats.repeated(settings.DB_REPEATED_QUERY_THRESHOLD):
+        logger.warning("%s: possible N+1, ran %dx: %s", route, n, " ".join(sql.split())[:200])
+
+
+# Engine-class listeners cover every engine, including the async engines'
+# sync facades. Outside a request (flush threads, listener) nothing is counted.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.count += 1
+    stats.elapsed_ms += (time.perf_counter() - started.pop()) * 1000
+    stats.statements[statement] += 1
+
+
+def enable_strict_lazy_loads(reg: Registry) -> None:
+    """
+    Switches every relationship left on the default lazy="select" to
+    lazy="raise" just before mappers are configured, so any accidental lazy
+    load raises instead of issuing a query. For test runs (DB_STRICT_LAZY_LOADS).
+    """
+
+    def _switch():
+        for mapper in reg.mappers:
+            for prop in mapper._props.values():
+                if isinstance(prop, RelationshipProperty) and prop.lazy == "select":
+                    prop.lazy = "raise"
+                    prop.strategy_key = (("lazy", "raise"),)
+
+    event.listen(Mapper, "before_configured", _switch, once=True)
@@ -1,8 +1,20 @@
 # app/utils/query_helpers.py
-from typing import Any, Type
-from fastapi import HTTPException, status
-from sqlalchemy import false  # Use the SQLAlchemy construct for 'False'
-from sqlalchemy.orm import Query
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Literal, Mapping, Sequence, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, Query as QueryParam, status
+from sqlalchemy import and_, false, or_  # Use the SQLAlchemy construct for 'False'
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+# Keyset pagination limits shared by every list endpoint
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# (column, direction); the last key must be unique (usually the primary key)
+SortKey = Tuple[InstrumentedAttribute, Literal["asc", "desc"]]
+Stmt = TypeVar("Stmt")
 
 def apply_permission_filter(
     query: Query, 
@@ -37,4 +49,82 @@ def apply_permission_filter(
     
     # If scope is 'none', we want a SQL-rendered FALSE (usually 1=0)
     # This satisfies Pylance's requirement for a _ColumnExpressionArgument
-    return query.filter(false())
\ No newline at end of file
+    return query.filter(false())
+
+
+class PageParams:
+    """Dependency: ?cursor=<opaque>&limit=<n> for keyset-paginated lists."""
+
+    def __init__(
+        self,
+        cursor: str | None = QueryParam(None, description="next_cursor from the previous page"),
+        limit: int = QueryParam(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column: InstrumentedAttribute, raw: Any) -> Any:
+    python_type = column.type.python_type
+    if raw is not None and python_type in (date, datetime, time):
+        return python_type.fromisoformat(raw)
+    return raw
+
+
+def encode_cursor(item: Any, sort: Sequence[SortKey]) -> str:
+    """Opaque cursor holding the sort-key values of the last row on a page."""
+    values = [_encode_value(getattr(item, column.key)) for column, _ in sort]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Sequence[SortKey]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(sort):
+            raise ValueError("cursor does not match this listing")
+        return [_decode_value(column, raw) for (column, _), raw in zip(sort, values)]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {e}")
+
+
+def apply_filters(query: Stmt, filters: Mapping[InstrumentedAttribute, Any]) -> Stmt:
+    """Equality filters for optional query parameters; None means 'not filtered'."""
+    for column, value in filters.items():
+        if value is not None:
+            query = query.where(column == value)
+    return query
+
+
+def apply_keyset(query: Stmt, sort: Sequence[SortKey], page: PageParams) -> Stmt:
+    """
+    Orders by the sort keys, seeks past the cursor and fetches limit + 1 rows
+    (the extra row only tells page_response whether there is a next page).
+    Works on both legacy Query and 2.0 select().
+    """
+    if page.cursor:
+        values = decode_cursor(page.cursor, sort)
+        # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... with per-key direction
+        clauses = []
+        for i, (column, direction) in enumerate(sort):
+            seek = column > values[i] if direction == "asc" else column < values[i]
+            equal_prefix = [c == v for (c, _), v in zip(sort[:i], values[:i])]
+            clauses.append(and_(*equal_prefix, seek))
+        query = query.where(or_(*clauses))
+
+    return query.order_by(
+        *[column.asc() if direction == "asc" else column.desc() for column, direction in sort]
+    ).limit(page.limit + 1)
+
+
+def page_response(rows: Sequence[Any], sort: Sequence[SortKey], page: PageParams) -> Dict[str, Any]:
+    """The {items, next_cursor} envelope for rows fetched with apply_keyset."""
+    items = list(rows[:page.limit])
+    next_cursor = encode_cursor(items[-1], sort) if len(rows) > page.limit else None
+    return {"items": items, "next_cursor": next_cursor}
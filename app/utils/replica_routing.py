@@ -0,0 +1,51 @@
+# app/utils/replica_routing.py
+from __future__ import annotations
+
+import time
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+
+# Read-your-writes: after a successful write the client is pinned to the primary
+# until this epoch timestamp. Browsers carry the cookie; other clients can echo
+# the response header back as a request header.
+DB_PIN_COOKIE = "db_pin_until"
+DB_PIN_HEADER = "X-DB-Pin-Until"
+
+READ_ONLY_METHODS = {"GET", "HEAD"}
+
+
+def _pinned_until(request: Request) -> float:
+    raw = request.headers.get(DB_PIN_HEADER) or request.cookies.get(DB_PIN_COOKIE)
+    try:
+        return float(raw) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+def wants_replica(request: Request) -> bool:
+    """True when this request's SELECTs may be served by a replica."""
+    if not settings.replica_urls or request.method not in READ_ONLY_METHODS:
+        return False
+    return _pinned_until(request) <= time.time()
+
+
+def pin_to_primary(request: Request, response: Response) -> None:
+    """Called after every request: successful writes pin the caller for the lag budget."""
+    if not settings.replica_urls or request.method in READ_ONLY_METHODS:
+        return
+    if response.status_code >= 400:
+        return
+
+    budget = settings.REPLICA_LAG_BUDGET_SECONDS
+    until = f"{time.time() + budget:.3f}"
+    response.headers[DB_PIN_HEADER] = until
+    response.set_cookie(
+        DB_PIN_COOKIE,
+        until,
+        max_age=int(budget) + 1,
+        httponly=True,
+        samesite="lax",
+    )
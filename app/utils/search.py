@@ -0,0 +1,79 @@
+# app/utils/search.py
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from sqlalchemy import Date, Integer, String, cast, func, literal, null, or_, select, union_all
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.sql import Select
+
+from app.models.reservation import Reservation
+from app.models.reservation_attendee import ReservationAttendee
+from app.models.user import User
+from app.utils.query_helpers import SortKey
+
+# Trigram indexes only help from three characters on
+MIN_QUERY_LENGTH = 3
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _matches(column, q: str, pattern: str):
+    """Substring or fuzzy word match; both are served by the column's gin_trgm_ops index."""
+    return or_(column.ilike(pattern, escape="\\"), column.op("%>")(q))
+
+
+def _score(q: str, column):
+    # word_similarity is float4; widened here so the keyset cursor round-trips
+    # exactly (a float4 read back as 0.6666667 never equals itself as float8)
+    return cast(func.word_similarity(q, column), DOUBLE_PRECISION)
+
+
+def search_query(q: str) -> Tuple[Select, List[SortKey]]:
+    """
+    One ranked UNION ALL over users (name, email), attendees (name) and
+    reservation notes, plus its keyset sort: best score first, then kind/id.
+    """
+    q = q.strip()
+    pattern = _like_pattern(q)
+
+    users = select(
+        literal("user", String).label("kind"),
+        User.id.label("id"),
+        func.greatest(_score(q, User.name), _score(q, User.email)).label("score"),
+        User.name.label("title"),
+        User.email.label("subtitle"),
+        cast(null(), Integer).label("reservation_id"),
+        cast(null(), Date).label("date"),
+    ).where(or_(_matches(User.name, q, pattern), _matches(User.email, q, pattern)))
+
+    attendees = (
+        select(
+            literal("attendee", String).label("kind"),
+            ReservationAttendee.id.label("id"),
+            _score(q, ReservationAttendee.name).label("score"),
+            ReservationAttendee.name.label("title"),
+            ReservationAttendee.attendee_type.label("subtitle"),
+            ReservationAttendee.reservation_id.label("reservation_id"),
+            Reservation.date.label("date"),
+        )
+        .join(Reservation, Reservation.id == ReservationAttendee.reservation_id)
+        .where(_matches(ReservationAttendee.name, q, pattern))
+    )
+
+    reservations = select(
+        literal("reservation", String).label("kind"),
+        Reservation.id.label("id"),
+        _score(q, Reservation.notes).label("score"),
+        Reservation.notes.label("title"),
+        Reservation.meal_type.label("subtitle"),
+        Reservation.id.label("reservation_id"),
+        Reservation.date.label("date"),
+    ).where(_matches(Reservation.notes, q, pattern))
+
+    hits = union_all(users, attendees, reservations).subquery("hits")
+    sort: List[SortKey] = [(hits.c.score, "desc"), (hits.c.kind, "asc"), (hits.c.id, "asc")]
+    return select(hits), sort
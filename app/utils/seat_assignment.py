@@ -0,0 +1,261 @@
+# app/utils/seat_assignment.py
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date as date_type
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+from sqlalchemy import Integer, cast, column, func, select, update, values
+from sqlalchemy.orm import Session
+
+from app.models.reservation import Reservation
+from app.models.reservation_attendee import ReservationAttendee
+from app.models.seat import Seat
+from app.utils.availability import INACTIVE_STATUSES
+from app.utils.floor_events import publish
+from app.utils.table_assignment import StalePlan
+
+
+@dataclass(frozen=True)
+class SeatInfo:
+    id: int
+    table_id: int
+    seat_number: int
+    is_accessible: bool
+    # Truthy Seat.preferences keys plus the position label, lower-cased
+    tags: FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class Guest:
+    id: int
+    reservation_id: int
+    table_id: int
+    seat_id: int | None
+    needs_accessible_seat: bool
+    preferences: Tuple[str, ...]
+
+    def matches(self, seat: SeatInfo) -> int:
+        return sum(1 for tag in self.preferences if tag in seat.tags)
+
+
+@dataclass
+class SeatingPlan:
+    day: date_type
+    meal_type: str
+    assigned: List[Dict[str, Any]] = field(default_factory=list)
+    unseated: List[Dict[str, Any]] = field(default_factory=list)
+    solve_ms: float = 0.0
+
+    @property
+    def changes(self) -> List[Dict[str, Any]]:
+        return [a for a in self.assigned if a["seat_id"] != a["previous_seat_id"]]
+
+    def summary(self, dry_run: bool) -> Dict[str, Any]:
+        """SeatAssignmentResponse shape."""
+        return {
+            "date": self.day,
+            "meal_type": self.meal_type,
+            "dry_run": dry_run,
+            "assigned": self.assigned,
+            "unseated": self.unseated,
+            "changed": len(self.changes),
+            "solve_ms": self.solve_ms,
+        }
+
+
+def _seat_tags(preferences: dict | None, position: str | None) -> FrozenSet[str]:
+    tags = {str(k).lower() for k, v in (preferences or {}).items() if v}
+    if position:
+        tags.add(position.strip().lower())
+    return frozenset(tags)
+
+
+def _window_cost(window: Sequence[SeatInfo], party: Sequence[Guest], fixed_numbers: Sequence[int]) -> Tuple[int, int]:
+    """
+    (accessibility shortfall, spread): seats outside the party inside its
+    seat_number span, plus accessible seats handed to guests who don't need
+    them, less preference matches.
+    """
+    needers = sum(1 for g in party if g.needs_accessible_seat)
+    accessible = sum(1 for s in window if s.is_accessible)
+    numbers = [s.seat_number for s in window] + list(fixed_numbers)
+    gaps = (max(numbers) - min(numbers) + 1) - len(numbers)
+    wanted = {tag for g in party for tag in g.preferences}
+    matches = sum(1 for s in window if s.tags & wanted)
+    return max(0, needers - accessible), 10 * gaps + 5 * max(0, accessible - needers) - matches
+
+
+def seat_party(
+    seats: List[SeatInfo],
+    party: List[Guest],
+    reseat: bool,
+) -> Tuple[Dict[int, SeatInfo], List[Tuple[Guest, str]]]:
+    """
+    Seats one reservation at its table: the party takes the run of
+    consecutive free seats (by seat_number) with the fewest gaps, covering
+    its accessibility needs first; then accessible seats go to guests who
+    need them and preferences pick among the rest. Without `reseat`,
+    guests already in a valid seat stay put and the others sit next to them.
+    """
+    by_id = {s.id: s for s in seats}
+    kept = {} if reseat else {g.id: by_id[g.seat_id] for g in party if g.seat_id in by_id}
+    taken = {s.id for s in kept.values()}
+    free = [s for s in seats if s.id not in taken]
+    # Guests needing access first, so they are the last to miss out on a small table
+    waiting = sorted((g for g in party if g.id not in kept), key=lambda g: (not g.needs_accessible_seat, g.id))
+
+    placed: Dict[int, SeatInfo] = dict(kept)
+    k = min(len(waiting), len(free))
+    if k:
+        fixed_numbers = [s.seat_number for s in kept.values()]
+        group = waiting[:k]
+        window = min(
+            (free[i:i + k] for i in range(len(free) - k + 1)),
+            key=lambda w: _window_cost(w, group, fixed_numbers),
+        )
+        pool = list(window)
+        for guest in group:
+            seat = max(
+                pool,
+                key=lambda s: (
+                    s.is_accessible == guest.needs_accessible_seat,
+                    guest.matches(s),
+                    -s.seat_number,
+                ),
+            )
+            pool.remove(seat)
+            placed[guest.id] = seat
+
+    unseated = [(g, "No free seat left at the table") for g in waiting[k:]]
+    return placed, unseated
+
+
+def plan_seating(
+    db: Session,
+    day: date_type,
+    meal_type: str,
+    dining_room_id: int | None = None,
+    table_id: int | None = None,
+    reseat: bool = False,
+) -> SeatingPlan:
+    """Two reads (the service's attendees, their tables' available seats), then solve per reservation."""
+    guest_q = (
+        select(
+            ReservationAttendee.id,
+            ReservationAttendee.reservation_id,
+            Reservation.table_id,
+            ReservationAttendee.seat_id,
+            ReservationAttendee.needs_accessible_seat,
+            ReservationAttendee.seat_preferences,
+        )
+        .join(Reservation, Reservation.id == ReservationAttendee.reservation_id)
+        .where(Reservation.date == day)
+        .where(Reservation.meal_type == meal_type)
+        .where(Reservation.table_id.is_not(None))
+        .where(Reservation.status.not_in(INACTIVE_STATUSES))
+        .order_by(ReservationAttendee.reservation_id, ReservationAttendee.id)
+    )
+    if dining_room_id is not None:
+        guest_q = guest_q.where(Reservation.dining_room_id == dining_room_id)
+    if table_id is not None:
+        guest_q = guest_q.where(Reservation.table_id == table_id)
+
+    parties: Dict[int, List[Guest]] = defaultdict(list)
+    for a_id, res_id, t_id, seat_id, needs, prefs in db.execute(guest_q):
+        parties[res_id].append(
+            Guest(a_id, res_id, t_id, seat_id, needs, tuple(str(p).lower() for p in (prefs or [])))
+        )
+
+    seats_by_table: Dict[int, List[SeatInfo]] = defaultdict(list)
+    table_ids = {party[0].table_id for party in parties.values()}
+    if table_ids:
+        for s_id, t_id, number, accessible, prefs, position in db.execute(
+            select(Seat.id, Seat.table_id, Seat.seat_number, Seat.is_accessible, Seat.preferences, Seat.position)
+            .where(Seat.table_id.in_(table_ids))
+            .where(Seat.is_available.is_(True))
+            .order_by(Seat.table_id, Seat.seat_number)
+        ):
+            seats_by_table[t_id].append(SeatInfo(s_id, t_id, number, accessible, _seat_tags(prefs, position)))
+
+    plan = SeatingPlan(day, meal_type)
+    started = time.perf_counter()
+    for res_id, party in parties.items():
+        placed, unseated = seat_party(seats_by_table.get(party[0].table_id, []), party, reseat)
+        for guest in party:
+            seat = placed.get(guest.id)
+            if seat is None:
+                continue
+            plan.assigned.append({
+                "attendee_id": guest.id,
+                "reservation_id": res_id,
+                "table_id": guest.table_id,
+                "seat_id": seat.id,
+                "seat_number": seat.seat_number,
+                "previous_seat_id": guest.seat_id,
+            })
+        for guest, reason in unseated:
+            plan.unseated.append({"attendee_id": guest.id, "reservation_id": res_id, "reason": reason})
+    plan.solve_ms = round((time.perf_counter() - started) * 1000, 2)
+    return plan
+
+
+def assign_seats(
+    db: Session,
+    day: date_type,
+    meal_type: str,
+    dining_room_id: int | None = None,
+    table_id: int | None = None,
+    reseat: bool = False,
+    dry_run: bool = False,
+) -> SeatingPlan:
+    """
+    Plans and (unless dry_run) writes every changed seat in one
+    UPDATE ... FROM (VALUES ...), with a floor event, in one transaction.
+    Raises StalePlan, after rolling back, if any attendee changed seat or
+    any reservation changed table (or was cancelled) meanwhile.
+    """
+    plan = plan_seating(db, day, meal_type, dining_room_id, table_id, reseat)
+    changes = plan.changes
+    if dry_run or not changes:
+        db.rollback()
+        return plan
+
+    # Each row only applies if the attendee still sits where the plan found
+    # them and their reservation is still at the planned table
+    chosen = values(
+        column("id", Integer),
+        column("reservation_id", Integer),
+        column("table_id", Integer),
+        column("previous_seat_id", Integer),
+        column("seat_id", Integer),
+        name="chosen",
+    ).data([
+        (c["attendee_id"], c["reservation_id"], c["table_id"], c["previous_seat_id"], c["seat_id"])
+        for c in changes
+    ])
+    updated = db.scalars(
+        update(ReservationAttendee)
+        .where(ReservationAttendee.id == chosen.c.id)
+        .where(ReservationAttendee.reservation_id == chosen.c.reservation_id)
+        # All-NULL on a first seating, which Postgres would type as text: cast it back
+        .where(ReservationAttendee.seat_id.is_not_distinct_from(cast(chosen.c.previous_seat_id, Integer)))
+        .where(Reservation.id == ReservationAttendee.reservation_id)
+        .where(Reservation.table_id == chosen.c.table_id)
+        .where(Reservation.status.not_in(INACTIVE_STATUSES))
+        .values(seat_id=chosen.c.seat_id, updated_at=func.now())
+        .returning(ReservationAttendee.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if len(updated) != len(changes):
+        db.rollback()
+        raise StalePlan(len(changes) - len(updated))
+
+    publish(db, "seats.assigned", day, {
+        "meal_type": meal_type,
+        "assignments": [{"id": c["attendee_id"], "reservation_id": c["reservation_id"], "seat_id": c["seat_id"]} for c in changes],
+    })
+    db.commit()
+    return plan
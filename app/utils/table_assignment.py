@@ -0,0 +1,232 @@
+# app/utils/table_assignment.py
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date as date_type, time as time_type
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Integer, column, func, select, update, values
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.reservation import Reservation
+from app.models.table_entity import TableEntity
+from app.utils.availability import (
+    INACTIVE_STATUSES,
+    TableInfo,
+    announce_change,
+    availability_index,
+    interval,
+    is_table_conflict,
+)
+from app.utils.floor_events import publish
+
+
+class StalePlan(Exception):
+    """Bookings changed between planning and writing; nothing was saved."""
+
+    def __init__(self, changed: int):
+        super().__init__(f"{changed} booking(s) changed while assigning tables")
+        self.changed = changed
+
+
+@dataclass(frozen=True)
+class PendingBooking:
+    """An active reservation in the room with no table yet."""
+    id: int
+    party_size: int
+    start_time: time_type
+    end_time: time_type
+
+    @property
+    def minutes(self) -> Tuple[int, int]:
+        return interval(self.start_time, self.end_time)
+
+
+@dataclass
+class AssignmentPlan:
+    day: date_type
+    meal_type: str
+    dining_room_id: int
+    assigned: List[Dict[str, Any]] = field(default_factory=list)
+    unassigned: List[Dict[str, Any]] = field(default_factory=list)
+    solve_ms: float = 0.0
+
+    @property
+    def wasted_seats(self) -> int:
+        return sum(a["seat_count"] - a["party_size"] for a in self.assigned)
+
+    def summary(self, dry_run: bool) -> Dict[str, Any]:
+        """TableAssignmentResponse shape."""
+        return {
+            "date": self.day,
+            "meal_type": self.meal_type,
+            "dining_room_id": self.dining_room_id,
+            "dry_run": dry_run,
+            "assigned": self.assigned,
+            "unassigned": self.unassigned,
+            "wasted_seats": self.wasted_seats,
+            "solve_ms": self.solve_ms,
+        }
+
+
+def _overlaps(booked: List[Tuple[int, int]], start: int, end: int) -> bool:
+    return any(s < end and start < e for s, e in booked)
+
+
+def solve(
+    tables: List[TableInfo],
+    booked: Dict[int, List[Tuple[int, int]]],
+    pending: List[PendingBooking],
+) -> Tuple[List[Tuple[PendingBooking, TableInfo]], List[Tuple[PendingBooking, str]]]:
+    """
+    Best-fit decreasing: largest parties first (earliest start breaks ties),
+    each onto the smallest table that seats it and is free for its slot.
+    Large parties would otherwise find the big tables already used by small
+    ones. `booked` is mutated with the new intervals.
+    """
+    by_capacity = sorted(tables, key=lambda t: (t.seat_count, t.table_number))
+    largest = by_capacity[-1].seat_count if by_capacity else 0
+
+    placed, failed = [], []
+    for booking in sorted(pending, key=lambda b: (-b.party_size, b.start_time, b.id)):
+        start, end = booking.minutes
+        for table in by_capacity:
+            if table.seat_count < booking.party_size:
+                continue
+            if not _overlaps(booked[table.id], start, end):
+                booked[table.id].append((start, end))
+                placed.append((booking, table))
+                break
+        else:
+            reason = (
+                f"No table seats {booking.party_size}"
+                if booking.party_size > largest
+                else "No large-enough table is free for this slot"
+            )
+            failed.append((booking, reason))
+    return placed, failed
+
+
+def plan_assignments(db: Session, day: date_type, meal_type: str, dining_room_id: int) -> AssignmentPlan:
+    """Three reads (tables, that day's booked intervals, unassigned bookings), then solve in memory."""
+    tables = [
+        TableInfo(*row)
+        for row in db.execute(
+            select(TableEntity.id, TableEntity.dining_room_id, TableEntity.table_number, TableEntity.seat_count)
+            .where(TableEntity.dining_room_id == dining_room_id)
+        )
+    ]
+
+    # Every active booking on these tables that day, whatever the meal: overlap is by time
+    booked: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for table_id, start, end in db.execute(
+        select(Reservation.table_id, Reservation.start_time, Reservation.end_time)
+        .where(Reservation.date == day)
+        .where(Reservation.table_id.in_([t.id for t in tables]))
+        .where(Reservation.status.not_in(INACTIVE_STATUSES))
+    ):
+        booked[table_id].append(interval(start, end))
+
+    # Nothing stores a requested party size separately: attendees are the party
+    pending = [
+        PendingBooking(res_id, max(count, 1), start, end)
+        for res_id, count, start, end in db.execute(
+            select(Reservation.id, Reservation.attendee_count, Reservation.start_time, Reservation.end_time)
+            .where(Reservation.date == day)
+            .where(Reservation.meal_type == meal_type)
+            .where(Reservation.dining_room_id == dining_room_id)
+            .where(Reservation.table_id.is_(None))
+            .where(Reservation.status.not_in(INACTIVE_STATUSES))
+        )
+    ]
+
+    started = time.perf_counter()
+    placed, failed = solve(tables, booked, pending)
+    plan = AssignmentPlan(day, meal_type, dining_room_id)
+    plan.solve_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    for booking, table in sorted(placed, key=lambda p: (p[0].start_time, p[1].table_number)):
+        plan.assigned.append({
+            "reservation_id": booking.id,
+            "table_id": table.id,
+            "table_number": table.table_number,
+            "seat_count": table.seat_count,
+            "party_size": booking.party_size,
+            "start_time": booking.start_time,
+            "end_time": booking.end_time,
+        })
+    for booking, reason in failed:
+        plan.unassigned.append({
+            "reservation_id": booking.id,
+            "party_size": booking.party_size,
+            "start_time": booking.start_time,
+            "reason": reason,
+        })
+    return plan
+
+
+def apply_plan(db: Session, plan: AssignmentPlan) -> List[int]:
+    """
+    Writes every assignment in one UPDATE ... FROM (VALUES ...), only onto
+    bookings that are still unassigned. Returns the ids it updated; the
+    caller rolls back if that is not the whole plan. Does not commit.
+    """
+    if not plan.assigned:
+        return []
+    chosen = values(
+        column("id", Integer), column("table_id", Integer), name="chosen"
+    ).data([(a["reservation_id"], a["table_id"]) for a in plan.assigned])
+    return list(
+        db.scalars(
+            update(Reservation)
+            .where(Reservation.id == chosen.c.id)
+            .where(Reservation.table_id.is_(None))
+            .values(table_id=chosen.c.table_id, updated_at=func.now())
+            .returning(Reservation.id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+
+
+def assign_tables(
+    db: Session,
+    day: date_type,
+    meal_type: str,
+    dining_room_id: int,
+    dry_run: bool = False,
+) -> AssignmentPlan:
+    """
+    Plans and (unless dry_run) saves table assignments in one transaction,
+    with the availability NOTIFY and a floor event. Raises StalePlan, after
+    rolling back, if another writer got there first.
+    """
+    plan = plan_assignments(db, day, meal_type, dining_room_id)
+    if dry_run or not plan.assigned:
+        db.rollback()
+        return plan
+
+    try:
+        updated = apply_plan(db, plan)
+    except IntegrityError as e:
+        db.rollback()
+        if not is_table_conflict(e):
+            raise
+        # A booking landed on one of the chosen tables after we read them
+        availability_index.evict(day)
+        raise StalePlan(1)
+    if len(updated) != len(plan.assigned):
+        db.rollback()
+        raise StalePlan(len(plan.assigned) - len(updated))
+
+    announce_change(db, day)
+    publish(db, "reservations.assigned", day, {
+        "dining_room_id": dining_room_id,
+        "meal_type": meal_type,
+        "assignments": [{"id": a["reservation_id"], "table_id": a["table_id"]} for a in plan.assigned],
+    })
+    db.commit()
+    availability_index.evict(day)
+    return plan
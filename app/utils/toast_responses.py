@@ -42,7 +42,22 @@ def error_table_taken(
         why="Booking conflict",
         where="Floor Plan",
         how="Choose a different table or time",
-        actions=[ActionButton(label="View Availability", action="navigate", params={"view": "/availability"})]
+        actions=[ActionButton(label="View Availability", action="navigate", params={"view": "/availability"})],
+        meta={"table_number": table_num, "alternatives": alternatives},
+    )
+    return ToastJSONResponse(toast, status_code=409)
+
+def error_assignment_stale(booking_date: date, meal_type: str, changed: int) -> ToastJSONResponse:
+    toast = ToastResponse(
+        status="error",
+        what="Assignment plan is out of date",
+        who="Another staff member",
+        when=f"{booking_date.strftime('%a %b %d')}, {meal_type}",
+        why=f"{changed} booking(s) changed while the plan was being saved",
+        where="Floor Plan",
+        how="Run the assignment again",
+        actions=[],
+        meta={"changed": changed},
     )
     return ToastJSONResponse(toast, status_code=409)
 
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SQL statements and latency per POST /api/reservations.
+Books one table on consecutive days (one slot per day, so nothing conflicts)
+and reads the X-DB-Queries / X-DB-Time headers added outside production.
+Run it against a live server, once per build you want to compare:
+    python -m benchmarks.bench_create --base http://127.0.0.1:8000 --token <JWT> \\
+        --room 1 --table 1 --start-date 2031-01-01 --count 200 --attendees 4
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from datetime import date, timedelta
+
+
+def create(base: str, token: str, body: dict) -> tuple[int, float, int, float]:
+    req = urllib.request.Request(
+        base + "/api/reservations",
+        data=json.dumps(body).encode(),
+        method="POST",
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            code, headers = resp.status, resp.headers
+    except urllib.error.HTTPError as e:
+        code, headers = e.code, e.headers
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return (
+        code,
+        elapsed_ms,
+        int(headers.get("X-DB-Queries", -1)),
+        float(headers.get("X-DB-Time", -1)),
+    )
+
+
+def pct(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True, help="Bearer token for a staff/admin user")
+    parser.add_argument("--room", type=int, required=True, help="dining_room_id")
+    parser.add_argument("--table", type=int, required=True, help="table_id with no bookings from --start-date on")
+    parser.add_argument("--start-date", default="2031-01-01")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--attendees", type=int, default=4)
+    args = parser.parse_args()
+
+    first = date.fromisoformat(args.start_date)
+    latencies, queries, db_ms, codes = [], [], [], {}
+    for i in range(args.count):
+        day = (first + timedelta(days=i)).isoformat()
+        code, ms, n, t = create(args.base, args.token, {
+            "dining_room_id": args.room,
+            "table_id": args.table,
+            "date": day,
+            "start_time": "19:00",
+            "reservation_time": f"{day}T19:00:00",
+            "meal_type": "Dinner",
+            "notes": "bench_create",
+            "attendees": [{"name": f"Guest {g + 1}", "attendee_type": "guest"} for g in range(args.attendees)],
+        })
+        codes[code] = codes.get(code, 0) + 1
+        if code == 201:
+            latencies.append(ms)
+            queries.append(n)
+            db_ms.append(t)
+
+    print(f"{args.count} creates, {args.attendees} attendees each: {codes}")
+    if latencies:
+        print(f"statements/create: mean {statistics.mean(queries):.1f}, max {max(queries)}")
+        print(f"db time/create:    mean {statistics.mean(db_ms):.2f} ms")
+        print(
+            f"latency:           p50 {pct(latencies, 0.5):.1f} ms, "
+            f"p95 {pct(latencies, 0.95):.1f} ms, p99 {pct(latencies, 0.99):.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GET /api/ops/search latency for a set of queries.
+Point it at a server whose database has realistic volume (the target is
+under 30 ms at a million attendee rows) and compare with EXPLAIN ANALYZE
+if a query regresses:
+    python -m benchmarks.bench_search --base http://127.0.0.1:8000 --token <JWT> \\
+        --query smith --query "birthday" --query jon@ --rounds 50
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.parse
+import urllib.request
+
+
+def search(base: str, token: str, q: str, limit: int) -> tuple[float, int, float]:
+    url = base + "/api/ops/search?" + urllib.parse.urlencode({"q": q, "limit": limit})
+    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        body = json.loads(resp.read())
+        db_ms = float(resp.headers.get("X-DB-Time", -1))
+    return (time.perf_counter() - started) * 1000, len(body["items"]), db_ms
+
+
+def pct(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True, help="Bearer token for a staff/admin user")
+    parser.add_argument("--query", action="append", required=True, help="Search text (repeatable)")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=25)
+    args = parser.parse_args()
+
+    for q in args.query:
+        search(args.base, args.token, q, args.limit)  # Warm up
+        latencies, db_ms, hits = [], [], 0
+        for _ in range(args.rounds):
+            ms, hits, t = search(args.base, args.token, q, args.limit)
+            latencies.append(ms)
+            db_ms.append(t)
+        print(
+            f"{q!r:>16}: {hits} hits/page, db mean {statistics.mean(db_ms):.2f} ms, "
+            f"latency p50 {pct(latencies, 0.5):.1f} ms, p95 {pct(latencies, 0.95):.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Load test: requests/sec for the hot read routes at N concurrent clients.
+Run it against a live server (once on the sync build, once on the async build):
+    python -m benchmarks.load_reads --base http://127.0.0.1:8000 --token <JWT> --clients 200
+"""
+import argparse
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+PATHS = [
+    "/api/ops/tables",
+    "/api/ops/seats",
+    "/api/ops/reservations",
+    "/api/menu-items/grouped",
+    "/api/notifications/unread-count",
+]
+
+
+def hammer(base: str, token: str, path: str, deadline: float, codes: Counter, lock: threading.Lock):
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.monotonic() < deadline:
+        req = urllib.request.Request(base + path, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                resp.read()
+                code = resp.status
+        except urllib.error.HTTPError as e:
+            code = e.code
+        except Exception:
+            code = 0
+        with lock:
+            codes[(path, code)] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True, help="Bearer token for a staff/admin user")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    args = parser.parse_args()
+
+    codes: Counter = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        for i in range(args.clients):
+            pool.submit(hammer, args.base, args.token, PATHS[i % len(PATHS)], deadline, codes, lock)
+
+    total = sum(codes.values())
+    print(f"{args.clients} clients, {args.seconds:.0f}s: {total / args.seconds:.1f} req/s")
+    for (path, code), n in sorted(codes.items()):
+        print(f"  {code or 'ERR':>3} {path}: {n / args.seconds:.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Concurrency check: N clients book the same table and slot at the same instant.
+Exactly one must get 201; every other must get 409 (error_table_taken).
+Run it against a live server with several workers so the creates really race:
+    python -m benchmarks.race_bookings --base http://127.0.0.1:8000 --token <JWT> \\
+        --room 1 --table 1 --date 2030-01-15 --clients 20
+Exits non-zero if the database let a double booking through.
+"""
+import argparse
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def book(base: str, token: str, body: bytes, start: threading.Barrier) -> int:
+    req = urllib.request.Request(
+        base + "/api/reservations",
+        data=body,
+        method="POST",
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+    )
+    start.wait()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except Exception:
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True, help="Bearer token for a staff/admin user")
+    parser.add_argument("--room", type=int, required=True, help="dining_room_id")
+    parser.add_argument("--table", type=int, required=True, help="table_id (free for the slot)")
+    parser.add_argument("--date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--time", default="19:00")
+    parser.add_argument("--clients", type=int, default=20)
+    args = parser.parse_args()
+
+    body = json.dumps({
+        "dining_room_id": args.room,
+        "table_id": args.table,
+        "date": args.date,
+        "start_time": args.time,
+        "reservation_time": f"{args.date}T{args.time}:00",
+        "meal_type": "Dinner",
+        "notes": "race_bookings",
+    }).encode()
+
+    start = threading.Barrier(args.clients)
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        codes = Counter(pool.map(lambda _: book(args.base, args.token, body, start), range(args.clients)))
+
+    print(f"{args.clients} parallel creates: " + ", ".join(f"{c or 'ERR'} x{n}" for c, n in sorted(codes.items())))
+    if codes[201] == 1 and codes[409] == args.clients - 1:
+        print("OK: exactly one booking won")
+        return 0
+    print("FAIL: expected one 201 and the rest 409")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())